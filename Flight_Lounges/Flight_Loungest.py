@@ -1,24 +1,19 @@
+import os
+import sys
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from itertools import permutations
-from itertools import combinations
 import folium
 from streamlit_folium import st_folium
-from folium.plugins import MarkerCluster
+import pipeline
+from route_overlay import add_folium_points, add_folium_routes
 
-# Function to load data from Google Sheets CSV
-@st.cache_data
-def load_data(csv_url):
-    try:
-        data = pd.read_csv(csv_url, encoding="utf-8", sep=",")
-        return data
-    except Exception as e:
-        st.error(f"Failed to load data: {e}")
-        return pd.DataFrame()
+# instrumentation.py is shared by the apps and lives at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from instrumentation import Profiler
 
 # Main function to build the app
 def main():
+    # Per-stage timings, shown in the sidebar with ?profile=1 (see instrumentation.py)
+    profiler = Profiler.from_environment("Flight_Lounges")
     try:
         st.title("Lounge and Airline Routes Dashboard")
         st.markdown("""
@@ -31,200 +26,168 @@ def main():
         Much of the data processing is done within [this Colab file](https://colab.research.google.com/drive/1-I0jMh-E69LxGCS-hZSY9tSNo-8sV1CD#scrollTo=hpvcOjcA9TVp).
         """)
        
-        # Load Lounges Data
-        csv_url = st.text_input("Enter the Google Sheets CSV URL for Lounges", 
+        # Load Lounges and Routes Data. Every later stage is keyed on these
+        # (source, version) pairs, see pipeline.py
+        csv_url = st.text_input("Enter the Google Sheets CSV URL (or a local CSV/Parquet path) for Lounges", 
                                 "https://drive.google.com/file/d/1dmumzrtLm-rkeUfbkjOhNiY7UJ1OC_rV/view?usp=sharing")
-        csv_url = 'https://drive.google.com/uc?id=' + csv_url.split('/')[-2]
-        lounges = load_data(csv_url)
-
-        # Load Routes Data
-        routes_csv = st.text_input("Enter the Google Sheets CSV URL for Routes", 
+        routes_csv = st.text_input("Enter the Google Sheets CSV URL (or a local CSV/Parquet path) for Routes", 
                                    "https://drive.google.com/file/d/1LVaUcPnBjYzq5kLMv5Bn4Bw__Hs1x-xw/view?usp=sharing")
-        routes_csv = 'https://drive.google.com/uc?id=' + routes_csv.split('/')[-2]
-        routes = load_data(routes_csv)
+        try:
+            with profiler.stage("load_data") as stage:
+                lounges_key = pipeline.data_key(csv_url)
+                routes_key = pipeline.data_key(routes_csv)
+                lounges = pipeline.load_lounges(lounges_key)
+                stage.rows_out = len(lounges)
+        except Exception as e:
+            st.error(f"Failed to load data: {e}")
+            return
 
         if not lounges.empty:
-            lounges["IATA_Airport"] = lounges["IATA Code"] + " - " + lounges["Airport Name"]
-
             # Sidebar Filters
             st.sidebar.header("Filters")
-            iata_airport_combined = lounges["IATA_Airport"].dropna().unique()
-            lounge_names = lounges["Lounge Name"].dropna().unique()
-
-            selected_iata_airport = st.sidebar.multiselect("Select Airport(s)", options=list(sorted(iata_airport_combined)), default=[])
-            selected_lounge_name = st.sidebar.selectbox("Select Lounge Name", options=["All"] + list(sorted(lounge_names)))
+            iata_airport_combined, lounge_names = pipeline.lounge_options(lounges_key)
 
-            # Apply filters
-            filtered_data = lounges.copy()
-            if selected_iata_airport:
-                filtered_data = filtered_data[filtered_data["IATA_Airport"].isin(selected_iata_airport)]
-            if selected_lounge_name != "All":
-                filtered_data = filtered_data[filtered_data["Lounge Name"] == selected_lounge_name]
+            selected_iata_airport = tuple(st.sidebar.multiselect("Select Airport(s)", options=iata_airport_combined, default=[]))
+            selected_lounge_name = st.sidebar.selectbox("Select Lounge Name", options=["All"] + lounge_names)
+            selection = (lounges_key, selected_iata_airport, selected_lounge_name)
 
-            # Grouping for tables
-            lounge_counts = (
-                filtered_data.groupby(["IATA_Airport", "Lounge Name"])
-                .size()
-                .reset_index(name="Count")
-            )
-
-            # Pivot for display
-            lounge_pivot = lounge_counts.pivot_table(index="Lounge Name", columns="IATA_Airport", values="Count", fill_value=0)
+            # Lounge x airport counts, sliced from the cube built once per dataset
+            with profiler.stage("pivots", rows_in=len(lounges)):
+                lounge_pivot, airport_pivot = pipeline.lounge_pivots(*selection)
 
             st.subheader("Lounge Count by Airport")
-            styled_pivot = lounge_pivot.style.background_gradient(cmap="Blues")
-            st.dataframe(styled_pivot)
+            pivot, column_config = lounge_pivot
+            profiler.dataframe("lounge pivot", pivot, column_config=column_config)
 
             # Airport Count by Lounge
-            airport_pivot = lounge_counts.pivot_table(index="IATA_Airport", columns="Lounge Name", values="Count", fill_value=0)
             st.subheader("Airport Count by Lounge")
-            styled_airport_pivot = airport_pivot.style.background_gradient(cmap="Greens")
-            st.dataframe(styled_airport_pivot)
+            pivot, column_config = airport_pivot
+            profiler.dataframe("airport pivot", pivot, column_config=column_config)
             
             
             #
             st.subheader("Map of All Selected Lounges vs. All Lounges")
 
+            has_coordinates = "Latitude" in lounges.columns and "Longitude" in lounges.columns
+            if has_coordinates:
+                with profiler.stage("lounge map build", rows_in=len(lounges)):
+                    fig_filtered, fig_lounge_filtered = pipeline.lounge_maps(*selection)
+
             st.markdown("### Filtered Lounges")
-            if "Latitude" in filtered_data.columns and "Longitude" in filtered_data.columns:
-                fig_filtered = px.scatter_mapbox(
-                    filtered_data,
-                    lat="Latitude",
-                    lon="Longitude",
-                    color="IATA_Airport",
-                    zoom=0,
-                    hover_name="Lounge Name",
-                    height=500,
-                    mapbox_style="carto-darkmatter"
-                )
-                st.plotly_chart(fig_filtered)
+            if has_coordinates:
+                profiler.plotly_chart("filtered lounge map", fig_filtered)
             else:
                 st.error("Latitude and Longitude columns are required for plotting the map.")
 
             st.markdown("All filtered Lounges")
-            if "Latitude" in lounges.columns and "Longitude" in lounges.columns:
-                fig_lounge_filtered = px.scatter_mapbox(
-                    filtered_data,
-                    lat="Latitude",
-                    lon="Longitude",
-                    color="Lounge Name",
-                    zoom = 0,
-                    hover_name="Lounge Name",
-                    height=500,
-                    mapbox_style="carto-darkmatter"
-                )
-                st.plotly_chart(fig_lounge_filtered)
+            if has_coordinates:
+                profiler.plotly_chart("all lounge map", fig_lounge_filtered)
             else:
                 st.error("Latitude and Longitude columns are required for plotting the map.")
 
 
-            # Restore previous route visualization between selected airports
-            st.subheader("Routes Between Selected Airports")
-    
-
-            routes_grouped = routes.groupby(["Source airport", "Destination airport"]).agg({
-                "Source Latitude": "first",
-                "Source Longitude": "first",
-                "Destination Latitude": "first",
-                "Destination Longitude": "first"
-            }).reset_index()
-            
-            
-            #st.dataframe(routes_grouped)
-            
-            #get the IATA codes since the airport names do not exist in the routes data
-            selected_iata_codes=filtered_data['IATA Code'].unique().tolist()
-            
-            #st.dataframe(routes_grouped)
-            
-            if len(selected_iata_codes) > 1:
-                # Generate possible routes as a set of (source, destination) tuples
-                possible_routes = {tuple(sorted(pair)) for pair in combinations(selected_iata_codes, 2)}
+            # Lounges around an airport and inside the visible map area
+            st.subheader("Lounges Near an Airport")
 
-                # Create a column with (Source, Destination) tuples for fast lookup
-                routes_grouped["route_tuple"] = routes_grouped.apply(lambda row: tuple(sorted((row["Source airport"], row["Destination airport"]))), axis=1)
-
-                # Filter grouped routes to only be the ones needed
-                routes_available = routes_grouped[routes_grouped["route_tuple"].apply(lambda x: x in possible_routes)]
-                
-                
+            st.sidebar.header("Find Lounges Nearby")
+            nearby_airport = st.sidebar.selectbox("Center Airport", ["Select an airport"] + iata_airport_combined)
+            radius_km = st.sidebar.slider("Search Radius (km)", 10, 2000, 250, step=10)
 
+            if nearby_airport == "Select an airport":
+                st.write("Select a center airport on the left to list lounges within the search radius.")
             else:
-                routes_available = routes_grouped[
-                    routes_grouped["Source airport"].isin(selected_iata_codes) |
-                    routes_grouped["Destination airport"].isin(selected_iata_codes)
-                ]
-                
-            st.dataframe(routes_available)
+                nearby_result = pipeline.nearby_lounges(lounges_key, nearby_airport.split(" - ")[0], radius_km)
+                if nearby_result is None:
+                    st.warning(f"No coordinates for {nearby_airport}, so nearby lounges cannot be found.")
+                else:
+                    nearby, (center_lat, center_lon) = nearby_result
+                    st.markdown(f"**{len(nearby)}** lounges within {radius_km} km of {nearby_airport}")
+                    st.dataframe(nearby[["Lounge Name", "IATA_Airport", "Distance (km)"]], hide_index=True)
+
+                    nearby_map = folium.Map(location=[center_lat, center_lon], zoom_start=6, tiles="CartoDB dark_matter")
+                    add_folium_points(nearby_map, nearby["Latitude"], nearby["Longitude"], nearby["Lounge Name"], name="Lounges")
+                    nearby_view = st_folium(nearby_map, returned_objects=["bounds"], key="nearby_map")
+
+                    # Bounds are reported once the map has rendered; until then they are missing or None
+                    bounds = (nearby_view or {}).get("bounds") or {}
+                    south_west, north_east = bounds.get("_southWest") or {}, bounds.get("_northEast") or {}
+                    corners = (south_west.get("lat"), south_west.get("lng"), north_east.get("lat"), north_east.get("lng"))
+                    if all(value is not None for value in corners):
+                        in_view = pipeline.lounges_in_view(lounges_key, *corners)
+                        st.markdown(f"**{len(in_view)}** lounges in the current map view")
+                        st.dataframe(in_view[["Lounge Name", "IATA_Airport"]], hide_index=True)
+
+            # Connecting itineraries, preferring connections with a chosen lounge
+            st.subheader("Plan an Itinerary")
+            airport_codes = list(pipeline.route_graph(routes_key).airports)
+
+            st.sidebar.header("Plan an Itinerary")
+            origin = st.sidebar.selectbox("From", ["Select an airport"] + airport_codes)
+            destination = st.sidebar.selectbox("To", ["Select an airport"] + airport_codes)
+            max_stops = st.sidebar.slider("Maximum Stops", 1, 3, 2)
+            preferred_lounge = st.sidebar.selectbox("Prefer Connections With Lounge", ["Any"] + lounge_names)
+
+            if origin == "Select an airport" or destination == "Select an airport":
+                st.write("Select an origin and destination on the left to search for itineraries.")
+            else:
+                itineraries = pipeline.plan_itineraries(routes_key, lounges_key, origin, destination, max_stops, preferred_lounge)
+
+                if itineraries.empty:
+                    st.write(f"No itineraries with up to {max_stops} stops from {origin} to {destination}.")
+                else:
+                    st.dataframe(itineraries.drop(columns="Cost"), hide_index=True)
+                    st.plotly_chart(pipeline.itinerary_map(routes_key, itineraries["Itinerary"].iloc[0]))
+
+            # Restore previous route visualization between selected airports
+            st.subheader("Routes Between Selected Airports")
+
+            with profiler.stage("route matching") as stage:
+                routes_available = pipeline.match_routes(routes_key, *selection)
+                stage.rows_out = len(routes_available)
+            profiler.dataframe("matched routes", routes_available)
             
             
             # Plot Routes
-            if not routes_available.empty:
-                for _, row in routes_available.iterrows():
-                    fig_filtered.add_scattermapbox(
-                        lon=[row["Source Longitude"], row["Destination Longitude"]],
-                        lat=[row["Source Latitude"], row["Destination Latitude"]],
-                        mode="lines",
-                        line=dict(width=2, color="blue"),
-                        name=f"{row['Source airport']} to {row['Destination airport']}"
-                    )
-                else:
-                    t=""
-                    
-                
-            
-                st.plotly_chart(fig_filtered)
+            if not routes_available.empty and has_coordinates:
+                great_circle = st.sidebar.checkbox("Draw routes as great circles", value=False)
+                with profiler.stage("route map build", rows_in=len(routes_available)):
+                    fig_routes = pipeline.routes_map(routes_key, *selection, great_circle)
+                profiler.plotly_chart("route map", fig_routes)
                 
                 # Sidebar: Select an Airport
                 st.sidebar.header("Select a Single Airport for Routes")
                 selected_airport = st.sidebar.selectbox(
                     "Select Airport", 
-                    ["Select an airport"] + list((lounges["IATA_Airport"]).unique())
+                    ["Select an airport"] + iata_airport_combined
                 )
 
                 if selected_airport == "Select an airport":
                     st.write("Please select an airport from the filters on the left.")
 
                 elif selected_airport:
-                    # Get the IATA code for the selected airport
-                    selected_airport_code = lounges[lounges["IATA_Airport"] == selected_airport]["IATA Code"].iloc[0]
+                    # Get the IATA code for the selected airport ("IATA - Airport Name")
+                    selected_airport_code = selected_airport.split(" - ")[0]
 
-                    # Filter routes that include the selected airport
-                    selected_routes = routes[
-                        (routes["Source airport"] == selected_airport_code) | (routes["Destination airport"] == selected_airport_code)
-                    ]
+                    # Routes that include the selected airport, straight from the adjacency index
+                    selected_routes, source_location = pipeline.airport_routes(routes_key, lounges_key, selected_airport_code)
 
                     st.subheader(f"Routes for {selected_airport} ({selected_airport_code})")
 
-                    # Create a base map centered at the selected airport
-                    source_lat = lounges[lounges["IATA Code"] == selected_airport_code]["Latitude"].iloc[0]
-                    source_lon = lounges[lounges["IATA Code"] == selected_airport_code]["Longitude"].iloc[0]
-                    
-                    m = folium.Map(location=[source_lat, source_lon], zoom_start=4, tiles="CartoDB dark_matter")
-
-                    # Create a marker cluster layer
-                    marker_cluster = MarkerCluster().add_to(m)
-                    
-                    # Add routes to the map
-                    for _, row in selected_routes.iterrows():
-                        source = (row["Source Latitude"], row["Source Longitude"])
-                        destination = (row["Destination Latitude"], row["Destination Longitude"])
-
-                        
-                        
-                        # Add markers for source and destination
-                        folium.Marker(
-                            source, 
-                            popup=f"Source: {row['Source airport']} ({row['Source airport']})",
-                            icon=folium.Icon(color="blue", icon="plane", prefix="fa")
-                        ).add_to(marker_cluster)
-
-                        # Add route as a line
-                        folium.PolyLine([source, destination], color="gold", weight=2.5, opacity=0.7).add_to(marker_cluster)
-
-                    # Display the map in Streamlit
-                    
-                    st_map = st_folium(m)
+                    if source_location is None:
+                        st.warning(f"No coordinates for {selected_airport_code}, so its routes cannot be mapped.")
+                    else:
+                        # Create a base map centered at the selected airport
+                        with profiler.stage("airport map build", rows_in=len(selected_routes)):
+                            m = folium.Map(location=list(source_location), zoom_start=4, tiles="CartoDB dark_matter")
+
+                            # Deduplicated airport markers and all routes as one GeoJSON layer
+                            add_folium_routes(m, selected_routes)
+
+                        # Display the map in Streamlit
+                        map_bytes = len(m.get_root().render()) if profiler.enabled else None
+                        with profiler.stage("airport map") as stage:
+                            stage.bytes = map_bytes
+                            st_folium(m, returned_objects=[])
 
             # # Single Airport Flight Routes
             # st.sidebar.header("Select a Single Airport for Routes")
@@ -277,6 +240,8 @@ def main():
             f"<h3 style='color: red; text-align: center;'>🚨 An error occurred. Please try selecting an airport or lounge 🚨 {e}</h3>", 
             unsafe_allow_html=True
         )
+    finally:
+        profiler.panel()
 
 if __name__ == "__main__":
     main()
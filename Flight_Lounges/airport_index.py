@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+
+def airport_locations(lounges):
+    """IATA code -> (lat, lon, lounges row label) from the first lounge row with coordinates."""
+    located = lounges.dropna(subset=["IATA Code", "Latitude", "Longitude"]).drop_duplicates("IATA Code")
+    return {
+        code: (float(lat), float(lon), row)
+        for code, lat, lon, row in zip(located["IATA Code"], located["Latitude"], located["Longitude"], located.index)
+    }
+
+
+class AirportIndex:
+    """
+    Adjacency index from airport to the routes that touch it.
+
+    Only route row positions are stored, sorted by airport code with
+    CSR-style offsets, so the routes of one airport are a single slice of
+    the caller's routes table and a lookup costs O(degree) rather than a
+    scan of the whole table; the table itself is not copied. Airport
+    positions come from the lounges table (first row per IATA code with
+    coordinates).
+    """
+
+    def __init__(self, routes, lounges):
+        source = routes["Source airport"].to_numpy(dtype=object)
+        destination = routes["Destination airport"].to_numpy(dtype=object)
+        codes = pd.unique(np.concatenate([source, destination]))
+        self.airports = pd.Index(codes[pd.notna(codes)]).astype(str).sort_values()
+
+        # A missing code is no airport, so that end of the route is not indexed
+        src = self.airports.get_indexer(pd.Index(source, dtype=object))
+        dst = self.airports.get_indexer(pd.Index(destination, dtype=object))
+        rows = np.arange(len(routes), dtype=np.int64)
+
+        # Each route is listed under both endpoints, self-loops only once
+        second = (dst >= 0) & (dst != src)
+        endpoint = np.concatenate([src, dst[second]])
+        route_row = np.concatenate([rows, rows[second]])
+        route_row, endpoint = route_row[endpoint >= 0], endpoint[endpoint >= 0]
+
+        order = np.argsort(endpoint, kind="stable")
+        self.route_rows = route_row[order]
+        self.offsets = np.zeros(len(self.airports) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(endpoint, minlength=len(self.airports)), out=self.offsets[1:])
+
+        self.locations = airport_locations(lounges)
+
+    def route_positions(self, iata_code):
+        """Row positions, in table order, of every route touching the airport in the indexed routes table."""
+        code = self.airports.get_indexer([iata_code])[0]
+        if code < 0:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(self.route_rows[self.offsets[code]:self.offsets[code + 1]])
+
+    def location(self, iata_code):
+        """(lat, lon, lounges row label) for the airport, or None if no lounge row has its coordinates."""
+        return self.locations.get(iata_code)
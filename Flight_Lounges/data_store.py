@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
+
+# Shared by every replica that mounts the same directory
+CACHE_DIR = os.environ.get(
+    "FLIGHT_LOUNGES_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data_cache"),
+)
+# Rows per chunk when streaming a table instead of loading it whole
+CHUNK_ROWS = int(os.environ.get("FLIGHT_LOUNGES_CHUNK_ROWS", 250_000))
+# Seconds a remote snapshot is trusted before revalidating with the server
+REMOTE_MAX_AGE = int(os.environ.get("FLIGHT_LOUNGES_CACHE_MAX_AGE", 3600))
+
+DRIVE_FILE = re.compile(r"drive\.google\.com/file/d/([^/]+)")
+# Every Parquet file starts (and ends) with these bytes
+PARQUET_MAGIC = b"PAR1"
+
+
+def normalize_source(source):
+    """Turn a Google Drive share link into a direct download URL, leave anything else alone."""
+    source = source.strip()
+    match = DRIVE_FILE.search(source)
+    if match:
+        return "https://drive.google.com/uc?id=" + match.group(1)
+    return source
+
+
+def is_url(source):
+    return source.startswith(("http://", "https://"))
+
+
+def is_parquet(path):
+    """Whether the local file at ``path`` is Parquet, by its magic bytes rather than its name."""
+    with open(path, "rb") as f:
+        return f.read(len(PARQUET_MAGIC)) == PARQUET_MAGIC
+
+
+def _source_key(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+def _meta_path(source):
+    return os.path.join(CACHE_DIR, _source_key(source) + ".json")
+
+
+def _read_meta(source):
+    try:
+        with open(_meta_path(source)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _atomic_write(path, write):
+    # Write next to the target then rename, so readers never see a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _write_meta(source, meta):
+    def write(tmp):
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+    _atomic_write(_meta_path(source), write)
+
+
+def _snapshot_path(content_hash):
+    return os.path.join(CACHE_DIR, content_hash + ".parquet")
+
+
+def _write_snapshot(raw, content_hash):
+    """Persist CSV (parsed once) or Parquet bytes as a Parquet snapshot named by content hash."""
+    path = _snapshot_path(content_hash)
+    if os.path.exists(path):
+        return path
+    if raw.startswith(PARQUET_MAGIC):
+        # Already Parquet (e.g. a remote .parquet file): store the bytes unchanged
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                f.write(raw)
+        _atomic_write(path, write)
+    else:
+        frame = pd.read_csv(BytesIO(raw), encoding="utf-8", sep=",")
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        _atomic_write(path, lambda tmp: pq.write_table(table, tmp))
+    return path
+
+
+def _snapshot_valid(meta):
+    return bool(meta.get("hash")) and os.path.exists(_snapshot_path(meta["hash"]))
+
+
+def _refresh_remote(url):
+    meta = _read_meta(url)
+    if _snapshot_valid(meta) and time.time() - meta.get("checked_at", 0) < REMOTE_MAX_AGE:
+        return _snapshot_path(meta["hash"])
+
+    headers = {}
+    if _snapshot_valid(meta):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=30)
+    except requests.RequestException:
+        # Serve a stale snapshot rather than nothing when the network is down
+        if _snapshot_valid(meta):
+            return _snapshot_path(meta["hash"])
+        raise
+
+    if response.status_code == 304 and _snapshot_valid(meta):
+        meta["checked_at"] = time.time()
+        _write_meta(url, meta)
+        return _snapshot_path(meta["hash"])
+    response.raise_for_status()
+
+    content_hash = hashlib.sha256(response.content).hexdigest()
+    path = _write_snapshot(response.content, content_hash)
+    _write_meta(url, {
+        "hash": content_hash,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "checked_at": time.time(),
+    })
+    return path
+
+
+def _refresh_local(path):
+    meta = _read_meta(path)
+    stat = os.stat(path)
+    if _snapshot_valid(meta) and meta.get("mtime") == stat.st_mtime and meta.get("size") == stat.st_size:
+        return _snapshot_path(meta["hash"])
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    content_hash = hashlib.sha256(raw).hexdigest()
+    snapshot = _write_snapshot(raw, content_hash)
+    _write_meta(path, {"hash": content_hash, "mtime": stat.st_mtime, "size": stat.st_size})
+    return snapshot
+
+
+def snapshot_for(source):
+    """
+    Path of a Parquet file holding ``source``.
+
+    Local Parquet files (recognised by their magic bytes, whatever the
+    name says) are used as-is. CSV files and URLs are converted once
+    into a content-hashed snapshot under CACHE_DIR, revalidated by mtime/size
+    for local files and by ETag/Last-Modified (after REMOTE_MAX_AGE) for URLs.
+    """
+    source = normalize_source(source)
+    if not is_url(source) and is_parquet(source):
+        return source
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if is_url(source):
+        return _refresh_remote(source)
+    return _refresh_local(os.path.abspath(source))
+
+
+def source_version(source):
+    """Identifier that changes whenever the data behind ``source`` changes."""
+    path = snapshot_for(source)
+    stat = os.stat(path)
+    return f"{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def load_table(source, columns=None):
+    """Load ``source`` (Parquet, CSV or URL) memory-mapped from its snapshot, reading only ``columns``."""
+    path = snapshot_for(source)
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [c for c in columns if c in available]
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas()
+
+
+def compact(frame, categorical=(), float32=()):
+    """Store repeated labels as ``category`` and coordinates as float32, in place of object/float64."""
+    for column in categorical:
+        if column in frame.columns and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype("category")
+    for column in float32:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("float32")
+    return frame
+
+
+def iter_chunks(source, columns=None, chunksize=CHUNK_ROWS):
+    """
+    Stream ``source`` as DataFrames of at most ``chunksize`` rows.
+
+    Record batches are read from the source's Parquet file (or snapshot), so
+    only one chunk is materialized as pandas at a time.
+    """
+    parquet = pq.ParquetFile(snapshot_for(source), memory_map=True)
+    if columns is not None:
+        columns = [c for c in columns if c in parquet.schema_arrow.names]
+    for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+        yield batch.to_pandas()
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+from spatial_index import haversine_km
+
+
+class RouteGraph:
+    """
+    Directed airport graph over the grouped routes, weighted by great-circle km.
+
+    Reuses the integer airport codes of a RouteIndex so edges are plain
+    int32 arrays; edges with missing coordinates are dropped.
+    """
+
+    def __init__(self, route_index):
+        routes = route_index.routes
+        self.airports = route_index.airports
+
+        lat1, lon1, lat2, lon2 = (
+            routes[c].to_numpy(dtype=np.float64)
+            for c in ("Source Latitude", "Source Longitude", "Destination Latitude", "Destination Longitude")
+        )
+        weight = haversine_km(lat1, lon1, lat2, lon2)
+        keep = ~np.isnan(weight) & (route_index.src != route_index.dst)
+
+        self.src = route_index.src[keep]
+        self.dst = route_index.dst[keep]
+        self.weight = weight[keep]
+
+        # First complete coordinate pair seen for each airport, from either end of a route
+        ends = pd.DataFrame({
+            "code": np.concatenate([route_index.src, route_index.dst]),
+            "lat": np.concatenate([lat1, lat2]),
+            "lon": np.concatenate([lon1, lon2]),
+        }).dropna()
+        position = ends.groupby("code", sort=False).first()
+        self.lat = np.full(len(self.airports), np.nan)
+        self.lon = np.full(len(self.airports), np.nan)
+        self.lat[position.index], self.lon[position.index] = position["lat"], position["lon"]
+
+    def code(self, iata_code):
+        return self.airports.get_indexer([iata_code])[0]
+
+    def _relax(self, cost):
+        """One more leg from every airport: best new cost and predecessor per airport."""
+        candidate = cost[self.src] + self.weight
+        reachable = np.isfinite(candidate)
+        candidate, src, dst = candidate[reachable], self.src[reachable], self.dst[reachable]
+
+        order = np.lexsort((candidate, dst))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = dst[order][1:] != dst[order][:-1]
+        best = order[first]
+
+        new_cost = np.full(len(self.airports), np.inf)
+        pred = np.full(len(self.airports), -1, dtype=np.int64)
+        new_cost[dst[best]] = candidate[best]
+        pred[dst[best]] = src[best]
+        return new_cost, pred
+
+    def itineraries(self, origin, destination, max_stops=3, preferred=(), penalty_km=500.0):
+        """
+        Shortest itinerary with 0..max_stops connections between two airports.
+
+        Hop-bounded shortest paths are computed layer by layer (one vectorized
+        relaxation of every edge per leg). Connecting at an airport outside
+        ``preferred`` adds ``penalty_km`` to the cost, so itineraries through
+        the chosen lounge network rank first. Returns a DataFrame sorted by cost.
+        """
+        columns = ["Stops", "Itinerary", "Distance (km)", "Lounge Connections", "Cost"]
+        start, goal = self.code(origin), self.code(destination)
+        if start < 0 or goal < 0 or start == goal:
+            return pd.DataFrame(columns=columns)
+
+        penalty = np.full(len(self.airports), float(penalty_km))
+        preferred_codes = self.airports.get_indexer(pd.Index(list(preferred), dtype=object))
+        penalty[preferred_codes[preferred_codes >= 0]] = 0.0
+
+        cost = np.full(len(self.airports), np.inf)
+        cost[start] = 0.0
+        preds = []
+        results = []
+        for legs in range(1, max_stops + 2):
+            # Leaving a connection airport costs its penalty, leaving the origin does not
+            leave = cost if legs == 1 else cost + penalty
+            leave[goal] = np.inf
+            cost, pred = self._relax(leave)
+            preds.append(pred)
+            if not np.isfinite(cost[goal]):
+                continue
+
+            path = [goal]
+            for pred_layer in reversed(preds):
+                path.append(pred_layer[path[-1]])
+            path = path[::-1]
+            if len(set(path)) != len(path):
+                continue
+
+            path = np.asarray(path)
+            distance = haversine_km(self.lat[path[:-1]], self.lon[path[:-1]], self.lat[path[1:]], self.lon[path[1:]]).sum()
+            connections = path[1:-1]
+            results.append({
+                "Stops": legs - 1,
+                "Itinerary": " → ".join(self.airports[path]),
+                "Distance (km)": round(float(distance), 1),
+                "Lounge Connections": int((penalty[connections] == 0).sum()),
+                "Cost": float(cost[goal]),
+            })
+
+        return pd.DataFrame(results, columns=columns).sort_values(["Cost", "Stops"]).reset_index(drop=True)
+
+    def legs(self, itinerary):
+        """Route-table shaped legs of an itinerary string, for drawing it on a map."""
+        path = self.airports.get_indexer(itinerary.split(" → "))
+        return pd.DataFrame({
+            "Source airport": self.airports[path[:-1]],
+            "Destination airport": self.airports[path[1:]],
+            "Source Latitude": self.lat[path[:-1]],
+            "Source Longitude": self.lon[path[:-1]],
+            "Destination Latitude": self.lat[path[1:]],
+            "Destination Longitude": self.lon[path[1:]],
+        })
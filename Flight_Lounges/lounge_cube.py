@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+
+class LoungeCube:
+    """
+    Sparse lounge x airport count matrix, built once per lounges table.
+
+    Stored as COO triplets (lounge code, airport code, count) against sorted
+    label indexes, so a filter selection is a boolean slice of the triplets
+    and only the selected block is ever densified.
+    """
+
+    def __init__(self, lounges):
+        counts = lounges.groupby(["Lounge Name", "IATA_Airport"]).size()
+        lounge_labels = counts.index.get_level_values("Lounge Name")
+        airport_labels = counts.index.get_level_values("IATA_Airport")
+
+        self.lounges = pd.Index(pd.unique(lounge_labels)).sort_values()
+        self.airports = pd.Index(pd.unique(airport_labels)).sort_values()
+        self.lounge_code = self.lounges.get_indexer(lounge_labels)
+        self.airport_code = self.airports.get_indexer(airport_labels)
+        self.count = counts.to_numpy(dtype=np.int64)
+
+    def slice(self, airports=None, lounge_name=None):
+        """
+        Lounge Name x IATA_Airport counts restricted to the given airports and
+        lounge (None means no restriction). Same shape and order as the
+        pivot_table over the filtered rows.
+        """
+        keep = np.ones(len(self.count), dtype=bool)
+        if airports:
+            codes = self.airports.get_indexer(pd.Index(airports, dtype=object))
+            selected = np.zeros(len(self.airports), dtype=bool)
+            selected[codes[codes >= 0]] = True
+            keep &= selected[self.airport_code]
+        if lounge_name is not None:
+            keep &= self.lounge_code == self.lounges.get_indexer([lounge_name])[0]
+
+        rows, row_pos = np.unique(self.lounge_code[keep], return_inverse=True)
+        cols, col_pos = np.unique(self.airport_code[keep], return_inverse=True)
+        matrix = np.zeros((len(rows), len(cols)), dtype=np.int64)
+        matrix[row_pos, col_pos] = self.count[keep]
+
+        return pd.DataFrame(
+            matrix,
+            index=pd.Index(self.lounges[rows], name="Lounge Name"),
+            columns=pd.Index(self.airports[cols], name="IATA_Airport"),
+        )
@@ -0,0 +1,246 @@
+import os
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from airport_index import AirportIndex, airport_locations
+from data_store import compact, iter_chunks, load_table, normalize_source, source_version
+from itinerary import RouteGraph
+from lounge_cube import LoungeCube
+from route_matching import ROUTE_COORDS, RouteIndex, group_route_chunks
+from route_overlay import add_route_overlay
+from spatial_index import GridIndex, map_view
+
+# Dashboard stages: load -> enrich -> filter -> aggregate -> route-match -> figures.
+# Each stage is cached on the (source, version) key of the tables it reads plus
+# the widget values it depends on, so a widget change only recomputes the stages
+# downstream of it. Indexes and figures (st.cache_resource) are shared between
+# reruns and sessions and must not be mutated by callers; tables handed to the
+# page (st.cache_data) are returned as a fresh copy on every call.
+
+# Columns of the routes data the app actually reads
+ROUTE_DATA_COLUMNS = [
+    "Airline", "Source airport", "Destination airport",
+    "Source Latitude", "Source Longitude", "Destination Latitude", "Destination Longitude",
+]
+
+# Columns of the lounges data the app actually reads
+LOUNGE_DATA_COLUMNS = ["IATA Code", "Airport Name", "Lounge Name", "Latitude", "Longitude"]
+
+ROUTE_CATEGORIES = ["Airline", "Source airport", "Destination airport"]
+ROUTE_FLOAT32 = ["Source Latitude", "Source Longitude", "Destination Latitude", "Destination Longitude"]
+
+# Stream the routes in chunks and keep only one row per (source, destination).
+# Lowest memory, but the single-airport route list loses per-airline rows.
+GROUP_ROUTES_ON_LOAD = os.environ.get("FLIGHT_LOUNGES_GROUP_ROUTES", "0") == "1"
+
+
+def data_key(source):
+    """(source, version) for a local Parquet/CSV path or a Google Sheets/Drive CSV URL."""
+    source = normalize_source(source)
+    return source, source_version(source)
+
+
+# === Load / enrich ===
+@st.cache_resource(max_entries=4)
+def load_routes(routes_key):
+    if GROUP_ROUTES_ON_LOAD:
+        routes = group_route_chunks(iter_chunks(routes_key[0], columns=ROUTE_DATA_COLUMNS))
+    else:
+        routes = load_table(routes_key[0], columns=ROUTE_DATA_COLUMNS)
+    return compact(routes, ROUTE_CATEGORIES, ROUTE_FLOAT32)
+
+
+@st.cache_resource(max_entries=4)
+def load_lounges(lounges_key):
+    lounges = compact(load_table(lounges_key[0], columns=LOUNGE_DATA_COLUMNS), float32=["Latitude", "Longitude"])
+    if not lounges.empty:
+        lounges["IATA_Airport"] = lounges["IATA Code"] + " - " + lounges["Airport Name"]
+    return lounges
+
+
+@st.cache_resource(max_entries=4)
+def lounge_options(lounges_key):
+    lounges = load_lounges(lounges_key)
+    return (
+        sorted(lounges["IATA_Airport"].dropna().unique()),
+        sorted(lounges["Lounge Name"].dropna().unique()),
+    )
+
+
+# === Indexes, built once per dataset version ===
+@st.cache_resource(max_entries=4)
+def route_index(routes_key):
+    return RouteIndex.from_routes(load_routes(routes_key))
+
+
+@st.cache_resource(max_entries=4)
+def route_graph(routes_key):
+    return RouteGraph(route_index(routes_key))
+
+
+@st.cache_resource(max_entries=4)
+def airport_index(routes_key, lounges_key):
+    return AirportIndex(load_routes(routes_key), load_lounges(lounges_key))
+
+
+@st.cache_resource(max_entries=4)
+def lounge_cube(lounges_key):
+    return LoungeCube(load_lounges(lounges_key))
+
+
+@st.cache_resource(max_entries=4)
+def lounge_locations(lounges_key):
+    return airport_locations(load_lounges(lounges_key))
+
+
+@st.cache_resource(max_entries=4)
+def lounge_grid(lounges_key):
+    lounges = load_lounges(lounges_key)
+    return GridIndex(lounges["Latitude"].to_numpy(), lounges["Longitude"].to_numpy())
+
+
+# === Filter ===
+@st.cache_data(max_entries=32)
+def filter_lounges(lounges_key, airports, lounge_name):
+    filtered_data = load_lounges(lounges_key)
+    if airports:
+        filtered_data = filtered_data[filtered_data["IATA_Airport"].isin(airports)]
+    if lounge_name != "All":
+        filtered_data = filtered_data[filtered_data["Lounge Name"] == lounge_name]
+    return filtered_data
+
+
+# === Aggregate ===
+def count_columns(frame):
+    """
+    Column config drawing each count as a bar scaled to its column's maximum,
+    so st.dataframe highlights the counts in the browser from the plain frame.
+    """
+    peaks = frame.max() if len(frame) else pd.Series(0, index=frame.columns)
+    return {
+        column: st.column_config.ProgressColumn(str(column), format="%d", min_value=0, max_value=max(int(peak), 1))
+        for column, peak in peaks.items()
+    }
+
+
+@st.cache_data(max_entries=32)
+def lounge_pivots(lounges_key, airports, lounge_name):
+    """
+    (lounge x airport, airport x lounge) count tables, each as a
+    (counts, column config) pair for st.dataframe.
+    """
+    lounge_pivot = lounge_cube(lounges_key).slice(
+        airports=list(airports),
+        lounge_name=None if lounge_name == "All" else lounge_name,
+    )
+    airport_pivot = lounge_pivot.T
+    return (
+        (lounge_pivot, count_columns(lounge_pivot)),
+        (airport_pivot, count_columns(airport_pivot)),
+    )
+
+
+# === Route match ===
+@st.cache_data(max_entries=32)
+def match_routes(routes_key, lounges_key, airports, lounge_name):
+    #get the IATA codes since the airport names do not exist in the routes data
+    selected_iata_codes = filter_lounges(lounges_key, airports, lounge_name)["IATA Code"].unique().tolist()
+    if len(selected_iata_codes) > 1:
+        # Routes where both ends are among the selected airports
+        return route_index(routes_key).among(selected_iata_codes)
+    return route_index(routes_key).touching(selected_iata_codes)
+
+
+@st.cache_data(max_entries=32)
+def airport_routes(routes_key, lounges_key, airport_code):
+    """
+    Routes touching one airport that have coordinates at both ends, and the
+    airport's (lat, lon), or None when no lounge row gives its position.
+    """
+    index = airport_index(routes_key, lounges_key)
+    routes = load_routes(routes_key).iloc[index.route_positions(airport_code)].dropna(subset=list(ROUTE_COORDS))
+    location = index.location(airport_code)
+    return routes, None if location is None else location[:2]
+
+
+@st.cache_data(max_entries=32)
+def nearby_lounges(lounges_key, airport_code, radius_km):
+    """
+    Lounges within ``radius_km`` of an airport, nearest first, and the
+    airport's (lat, lon); None when no lounge row gives its position.
+    """
+    location = lounge_locations(lounges_key).get(airport_code)
+    if location is None:
+        return None
+    lat, lon, _ = location
+    positions, distance_km = lounge_grid(lounges_key).within_radius(lat, lon, radius_km)
+    nearby = load_lounges(lounges_key).iloc[positions].assign(**{"Distance (km)": distance_km.round(1)})
+    return nearby, (lat, lon)
+
+
+@st.cache_data(max_entries=32)
+def lounges_in_view(lounges_key, south, west, north, east):
+    return load_lounges(lounges_key).iloc[lounge_grid(lounges_key).within_bbox(south, west, north, east)]
+
+
+@st.cache_data(max_entries=32)
+def plan_itineraries(routes_key, lounges_key, origin, destination, max_stops, preferred_lounge):
+    preferred_airports = []
+    if preferred_lounge != "Any":
+        lounges = load_lounges(lounges_key)
+        preferred_airports = lounges.loc[lounges["Lounge Name"] == preferred_lounge, "IATA Code"].dropna().unique()
+    return route_graph(routes_key).itineraries(origin, destination, max_stops=max_stops, preferred=preferred_airports)
+
+
+# === Figures ===
+@st.cache_resource(max_entries=32)
+def lounge_maps(lounges_key, airports, lounge_name):
+    """Filtered lounges coloured by airport and by lounge, fitted to the filtered points."""
+    filtered_data = filter_lounges(lounges_key, airports, lounge_name)
+    map_center, map_zoom = map_view(filtered_data["Latitude"], filtered_data["Longitude"])
+    figures = []
+    for color in ("IATA_Airport", "Lounge Name"):
+        figures.append(px.scatter_mapbox(
+            filtered_data,
+            lat="Latitude",
+            lon="Longitude",
+            color=color,
+            center=map_center,
+            zoom=map_zoom,
+            hover_name="Lounge Name",
+            height=500,
+            mapbox_style="carto-darkmatter"
+        ))
+    return tuple(figures)
+
+
+@st.cache_resource(max_entries=32)
+def routes_map(routes_key, lounges_key, airports, lounge_name, great_circle):
+    # Copy so the cached lounge map is left without the overlay
+    fig = go.Figure(lounge_maps(lounges_key, airports, lounge_name)[0])
+    add_route_overlay(fig, match_routes(routes_key, lounges_key, airports, lounge_name), great_circle=great_circle)
+    return fig
+
+
+@st.cache_resource(max_entries=32)
+def itinerary_map(routes_key, itinerary):
+    best_legs = route_graph(routes_key).legs(itinerary)
+    map_center, map_zoom = map_view(
+        pd.concat([best_legs["Source Latitude"], best_legs["Destination Latitude"]]),
+        pd.concat([best_legs["Source Longitude"], best_legs["Destination Longitude"]]),
+    )
+    fig_itinerary = px.scatter_mapbox(
+        best_legs,
+        lat="Source Latitude",
+        lon="Source Longitude",
+        hover_name="Source airport",
+        center=map_center,
+        zoom=map_zoom,
+        height=500,
+        mapbox_style="carto-darkmatter"
+    )
+    add_route_overlay(fig_itinerary, best_legs, color="gold", great_circle=True, name=itinerary)
+    return fig_itinerary
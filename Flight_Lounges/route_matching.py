@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+ROUTE_COORDS = {
+    "Source Latitude": "first",
+    "Source Longitude": "first",
+    "Destination Latitude": "first",
+    "Destination Longitude": "first",
+}
+
+
+def group_routes(routes):
+    """Collapse the raw routes table to one row per (source, destination)."""
+    return routes.groupby(["Source airport", "Destination airport"], observed=True).agg(ROUTE_COORDS).reset_index()
+
+
+def group_route_chunks(chunks):
+    """
+    Group a stream of raw route chunks into the grouped-route table.
+
+    Each chunk is reduced to one row per (source, destination) as it
+    arrives, keeping the first coordinates and a route count, so the raw
+    table never has to be held in memory at once. Routes missing either
+    airport code are dropped, as ``group_routes`` does.
+    """
+    keys = ["Source airport", "Destination airport"]
+    partials = []
+    for chunk in chunks:
+        # Before the string conversion, which would turn a missing code into a "nan" airport
+        chunk = chunk.dropna(subset=keys).astype({key: str for key in keys})
+        grouped = chunk.groupby(keys, sort=False).agg(ROUTE_COORDS)
+        grouped["Route Count"] = chunk.groupby(keys, sort=False).size()
+        partials.append(grouped)
+
+    if not partials:
+        return pd.DataFrame(columns=keys + list(ROUTE_COORDS) + ["Route Count"])
+    combined = pd.concat(partials)
+    aggregations = dict(ROUTE_COORDS, **{"Route Count": "sum"})
+    return combined.groupby(level=keys).agg(aggregations).reset_index()
+
+
+class RouteIndex:
+    """
+    Integer-coded view of the grouped routes table.
+
+    Source/destination IATA codes are encoded once against a shared set of
+    categories so that every lookup is array membership over int32 codes
+    instead of Python tuples. The undirected pair key packs (min, max) of the
+    two codes into a single int64; routes are kept sorted by it, so the routes
+    among a small selection are found by binary search for each selected pair
+    rather than by scanning the table.
+    """
+
+    def __init__(self, routes_grouped):
+        # A missing code is no airport, not one called "nan"
+        self.routes = routes_grouped.dropna(subset=["Source airport", "Destination airport"]).reset_index(drop=True)
+
+        source = self.routes["Source airport"].astype(str)
+        destination = self.routes["Destination airport"].astype(str)
+        self.airports = pd.Index(pd.unique(np.concatenate([source.to_numpy(), destination.to_numpy()]))).sort_values()
+
+        self.src = self.airports.get_indexer(source).astype(np.int32)
+        self.dst = self.airports.get_indexer(destination).astype(np.int32)
+
+        n = np.int64(len(self.airports))
+        self.pair_key = np.minimum(self.src, self.dst).astype(np.int64) * n + np.maximum(self.src, self.dst)
+        self._by_pair = np.argsort(self.pair_key, kind="stable")
+        self._sorted_pairs = self.pair_key[self._by_pair]
+
+    @classmethod
+    def from_routes(cls, routes):
+        return cls(group_routes(routes))
+
+    def __len__(self):
+        return len(self.routes)
+
+    def encode(self, iata_codes):
+        """Map IATA codes to airport codes, dropping any not present in the routes."""
+        codes = self.airports.get_indexer(pd.Index(iata_codes, dtype=object))
+        return codes[codes >= 0]
+
+    def _selected(self, iata_codes):
+        selected = np.zeros(len(self.airports), dtype=bool)
+        selected[self.encode(iata_codes)] = True
+        return selected
+
+    def among_positions(self, iata_codes):
+        """Row positions, in table order, of routes whose both endpoints are (distinct) selected airports."""
+        codes = np.unique(self.encode(iata_codes))
+        if len(codes) * (len(codes) - 1) // 2 > len(self.routes):
+            # More candidate pairs than routes: one pass over the table is cheaper
+            return np.flatnonzero(self.among_mask(iata_codes))
+
+        first, second = np.triu_indices(len(codes), k=1)
+        keys = codes[first].astype(np.int64) * len(self.airports) + codes[second]
+        lo = np.searchsorted(self._sorted_pairs, keys, side="left")
+        lengths = np.searchsorted(self._sorted_pairs, keys, side="right") - lo
+        # Concatenate the ranges lo[i]:lo[i] + lengths[i] without a Python loop
+        offsets = np.repeat(lo - np.cumsum(lengths) + lengths, lengths)
+        return np.sort(self._by_pair[offsets + np.arange(lengths.sum())])
+
+    def among_mask(self, iata_codes):
+        """Routes whose both endpoints are (distinct) selected airports."""
+        selected = self._selected(iata_codes)
+        return selected[self.src] & selected[self.dst] & (self.src != self.dst)
+
+    def touching_mask(self, iata_codes):
+        """Routes with at least one endpoint among the selected airports."""
+        selected = self._selected(iata_codes)
+        return selected[self.src] | selected[self.dst]
+
+    def among(self, iata_codes):
+        return self.routes.iloc[self.among_positions(iata_codes)]
+
+    def touching(self, iata_codes):
+        return self.routes[self.touching_mask(iata_codes)]
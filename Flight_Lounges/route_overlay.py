@@ -0,0 +1,142 @@
+import folium
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from folium.plugins import FastMarkerCluster
+
+ROUTE_COLUMNS = ("Source Latitude", "Source Longitude", "Destination Latitude", "Destination Longitude")
+
+
+def great_circle_points(lat1, lon1, lat2, lon2, n_points=24):
+    """
+    Densify every route along its great circle in one vectorized pass.
+
+    Inputs are 1-d arrays in degrees, output is two (routes, n_points) arrays.
+    Longitudes are unwrapped per route so lines do not jump across the map at
+    the antimeridian.
+    """
+    phi1, lam1, phi2, lam2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lon1, lat2, lon2))
+
+    # Unit vectors of both endpoints
+    p1 = np.stack([np.cos(phi1) * np.cos(lam1), np.cos(phi1) * np.sin(lam1), np.sin(phi1)], axis=-1)
+    p2 = np.stack([np.cos(phi2) * np.cos(lam2), np.cos(phi2) * np.sin(lam2), np.sin(phi2)], axis=-1)
+    omega = np.arccos(np.clip((p1 * p2).sum(axis=-1), -1.0, 1.0))[:, None]
+
+    t = np.linspace(0.0, 1.0, n_points)[None, :]
+    sin_omega = np.sin(omega)
+    # Coincident endpoints fall back to linear interpolation
+    safe = sin_omega > 1e-12
+    w1 = np.where(safe, np.sin((1 - t) * omega) / np.where(safe, sin_omega, 1.0), 1 - t)
+    w2 = np.where(safe, np.sin(t * omega) / np.where(safe, sin_omega, 1.0), t)
+    points = w1[..., None] * p1[:, None, :] + w2[..., None] * p2[:, None, :]
+
+    lat = np.degrees(np.arctan2(points[..., 2], np.hypot(points[..., 0], points[..., 1])))
+    lon = np.degrees(np.unwrap(np.arctan2(points[..., 1], points[..., 0]), axis=1))
+    return lat, lon
+
+
+def route_line_arrays(routes, great_circle=False, n_points=24):
+    """
+    Flatten routes into single lat/lon arrays with a NaN gap after each route.
+
+    Plotly serializes NaN as null, which breaks the line, so every route can
+    live in one trace.
+    """
+    lat1, lon1, lat2, lon2 = routes[list(ROUTE_COLUMNS)].to_numpy(dtype=np.float64).T
+
+    if great_circle:
+        lat, lon = great_circle_points(lat1, lon1, lat2, lon2, n_points)
+    else:
+        lat = np.column_stack([lat1, lat2])
+        lon = np.column_stack([lon1, lon2])
+
+    gap = np.full((len(routes), 1), np.nan)
+    return np.hstack([lat, gap]).ravel(), np.hstack([lon, gap]).ravel()
+
+
+def add_route_overlay(fig, routes, color_by=None, color="blue", width=2, great_circle=False, name="Routes"):
+    """
+    Add routes to a mapbox figure as one Scattermapbox trace, or one per
+    value of ``color_by`` when a column is given.
+    """
+    if routes.empty:
+        return fig
+
+    if color_by is None:
+        groups = [(name, routes)]
+    else:
+        groups = routes.groupby(color_by, observed=True, sort=True)
+
+    for label, group in groups:
+        lat, lon = route_line_arrays(group, great_circle=great_circle)
+        line = dict(width=width) if color_by is not None else dict(width=width, color=color)
+        fig.add_trace(go.Scattermapbox(
+            lat=lat,
+            lon=lon,
+            mode="lines",
+            line=line,
+            name=str(label),
+            hoverinfo="skip",
+        ))
+    return fig
+
+
+# Client-side marker callback for FastMarkerCluster, rows are [lat, lon, label]
+AIRPORT_MARKER_CALLBACK = """(function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'plane', prefix: 'fa', markerColor: 'blue'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.setIcon(icon);
+    marker.bindPopup(row[2]);
+    return marker;
+})"""
+
+
+def route_endpoints(routes):
+    """One row per airport appearing at either end of the routes, with its position."""
+    source = routes[["Source airport", "Source Latitude", "Source Longitude"]]
+    destination = routes[["Destination airport", "Destination Latitude", "Destination Longitude"]]
+    columns = ["Airport", "Latitude", "Longitude"]
+    endpoints = pd.concat([source.set_axis(columns, axis=1), destination.set_axis(columns, axis=1)], ignore_index=True)
+    return endpoints.dropna().drop_duplicates("Airport")
+
+
+def route_multilinestring(routes, precision=4):
+    """GeoJSON MultiLineString with one segment per distinct (source, destination) pair."""
+    pairs = routes.drop_duplicates(["Source airport", "Destination airport"]).dropna(subset=list(ROUTE_COLUMNS))
+    coords = pairs[list(ROUTE_COLUMNS)].to_numpy(dtype=np.float64).round(precision)
+    # (routes, 2 points, [lon, lat]) as GeoJSON expects
+    segments = coords[:, [1, 0, 3, 2]].reshape(-1, 2, 2)
+    return {
+        "type": "Feature",
+        "properties": {},
+        "geometry": {"type": "MultiLineString", "coordinates": segments.tolist()},
+    }
+
+
+def add_folium_points(m, lat, lon, labels, precision=4, name="Points"):
+    """Add points to a folium map as one client-side FastMarkerCluster layer."""
+    marker_rows = [
+        [la, lo, str(label)]
+        for la, lo, label in zip(np.round(np.asarray(lat, dtype=np.float64), precision), np.round(np.asarray(lon, dtype=np.float64), precision), labels)
+    ]
+    FastMarkerCluster(marker_rows, callback=AIRPORT_MARKER_CALLBACK, name=name).add_to(m)
+    return m
+
+
+def add_folium_routes(m, routes, color="gold", weight=2.5, opacity=0.7, precision=4):
+    """
+    Bulk-render routes on a folium map: deduplicated airport markers in a
+    single FastMarkerCluster and every route in one GeoJSON layer.
+    """
+    if routes.empty:
+        return m
+
+    endpoints = route_endpoints(routes)
+    add_folium_points(m, endpoints["Latitude"], endpoints["Longitude"], endpoints["Airport"], precision=precision, name="Airports")
+
+    folium.GeoJson(
+        route_multilinestring(routes, precision),
+        name="Routes",
+        style_function=lambda _: {"color": color, "weight": weight, "opacity": opacity},
+    ).add_to(m)
+    return m
@@ -0,0 +1,104 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km, broadcasting over numpy arrays of degrees."""
+    lat1, lon1, lat2, lon2 = (np.radians(a) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GridIndex:
+    """
+    Fixed-size lat/lon grid over a set of points.
+
+    Point positions are stored sorted by cell id (lat row major) with
+    CSR-style offsets, so a rectangle of cells is one slice per lat row and
+    a query only inspects points in nearby cells. Positions refer to the
+    rows of the arrays the index was built from; NaN coordinates are left out.
+    """
+
+    def __init__(self, lat, lon, cell_deg=1.0):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.cell_deg = cell_deg
+        self.n_rows = int(np.ceil(180 / cell_deg))
+        self.n_cols = int(np.ceil(360 / cell_deg))
+
+        valid = np.flatnonzero(~(np.isnan(self.lat) | np.isnan(self.lon)))
+        cells = self._cell(self.lat[valid], self.lon[valid])
+        order = np.argsort(cells, kind="stable")
+        self.positions = valid[order]
+        self.offsets = np.zeros(self.n_rows * self.n_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self.n_rows * self.n_cols), out=self.offsets[1:])
+
+    def _row(self, lat):
+        return np.clip(((np.asarray(lat) + 90) // self.cell_deg).astype(np.int64), 0, self.n_rows - 1)
+
+    def _col(self, lon):
+        return np.clip(((np.asarray(lon) + 180) // self.cell_deg).astype(np.int64), 0, self.n_cols - 1)
+
+    def _cell(self, lat, lon):
+        return self._row(lat) * self.n_cols + self._col(lon)
+
+    def _candidates(self, south, west, north, east):
+        """Positions of points in every cell overlapping the box (west <= east, no wrap)."""
+        first_col, last_col = self._col(west), self._col(east)
+        chunks = []
+        for row in range(self._row(south), self._row(north) + 1):
+            start = self.offsets[row * self.n_cols + first_col]
+            stop = self.offsets[row * self.n_cols + last_col + 1]
+            chunks.append(self.positions[start:stop])
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+    def _lon_ranges(self, west, east):
+        # A viewport crossing the antimeridian has west > east
+        west = (west + 180) % 360 - 180 if abs(west) > 180 else west
+        east = (east + 180) % 360 - 180 if abs(east) > 180 else east
+        if west <= east:
+            return [(west, east)]
+        return [(west, 180.0), (-180.0, east)]
+
+    def within_bbox(self, south, west, north, east):
+        """Sorted positions of points inside the lat/lon box."""
+        if east - west >= 360:
+            west, east = -180.0, 180.0
+        found = []
+        for lo, hi in self._lon_ranges(west, east):
+            candidates = self._candidates(south, lo, north, hi)
+            lat, lon = self.lat[candidates], self.lon[candidates]
+            found.append(candidates[(lat >= south) & (lat <= north) & (lon >= lo) & (lon <= hi)])
+        return np.sort(np.concatenate(found))
+
+    def within_radius(self, lat, lon, radius_km):
+        """Positions and distances (km) of points within ``radius_km`` of (lat, lon), nearest first."""
+        dlat = radius_km / KM_PER_DEGREE
+        south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+        widest = max(abs(south), abs(north))
+        if widest >= 89.9 or dlat / np.cos(np.radians(widest)) >= 180:
+            ranges = [(-180.0, 180.0)]
+        else:
+            dlon = dlat / np.cos(np.radians(widest))
+            ranges = self._lon_ranges(lon - dlon, lon + dlon)
+
+        candidates = np.unique(np.concatenate([self._candidates(south, lo, north, hi) for lo, hi in ranges]))
+        distance = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = distance <= radius_km
+        order = np.argsort(distance[inside], kind="stable")
+        return candidates[inside][order], distance[inside][order]
+
+
+def map_view(lat, lon, max_zoom=10):
+    """Center and an approximate zoom level that fit the given points on a web map."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    if not valid.any():
+        return {"lat": 0.0, "lon": 0.0}, 0
+    lat, lon = lat[valid], lon[valid]
+    span = max(lon.max() - lon.min(), (lat.max() - lat.min()) * 2, 1e-6)
+    zoom = float(np.clip(np.log2(360 / span) - 0.5, 0, max_zoom))
+    return {"lat": float((lat.min() + lat.max()) / 2), "lon": float((lon.min() + lon.max()) / 2)}, zoom
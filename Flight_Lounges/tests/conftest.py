@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# The app's modules are imported the way Streamlit runs them, from the app folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+AIRPORTS = {
+    # code: (lat, lon)
+    "AAA": (0.0, 0.0),
+    "BBB": (0.0, 10.0),
+    "CCC": (0.0, 20.0),
+    "DDD": (0.0, 30.0),
+    "EEE": (10.0, 15.0),
+}
+
+
+def route(airline, source, destination):
+    (slat, slon), (dlat, dlon) = AIRPORTS[source], AIRPORTS[destination]
+    return {
+        "Airline": airline,
+        "Source airport": source,
+        "Destination airport": destination,
+        "Source Latitude": slat,
+        "Source Longitude": slon,
+        "Destination Latitude": dlat,
+        "Destination Longitude": dlon,
+    }
+
+
+@pytest.fixture
+def routes():
+    """A small network: a chain AAA-BBB-CCC-DDD plus a detour through EEE."""
+    return pd.DataFrame([
+        route("XX", "AAA", "BBB"),
+        route("XX", "BBB", "CCC"),
+        route("YY", "CCC", "DDD"),
+        route("YY", "BBB", "EEE"),
+        route("YY", "EEE", "DDD"),
+        route("ZZ", "AAA", "BBB"),
+    ])
+
+
+@pytest.fixture
+def lounges():
+    return pd.DataFrame({
+        "IATA Code": ["AAA", "BBB", "EEE", "FFF"],
+        "Airport Name": ["Alpha", "Bravo", "Echo", "Foxtrot"],
+        "Lounge Name": ["Club", "Club", "Plaza", "Club"],
+        "Latitude": [0.0, 0.0, 10.0, float("nan")],
+        "Longitude": [0.0, 10.0, 15.0, float("nan")],
+    })
@@ -0,0 +1,32 @@
+import numpy as np
+
+from airport_index import AirportIndex
+
+
+def touching_mask(routes, code):
+    return (routes["Source airport"] == code) | (routes["Destination airport"] == code)
+
+
+def test_route_positions_list_both_directions(routes, lounges):
+    index = AirportIndex(routes, lounges)
+    for code in ("AAA", "BBB", "EEE"):
+        np.testing.assert_array_equal(index.route_positions(code), np.flatnonzero(touching_mask(routes, code)))
+    assert len(index.route_positions("BBB")) == 4
+    assert len(index.route_positions("ZZZ")) == 0
+
+
+def test_missing_codes_and_self_loops(routes, lounges):
+    routes = routes.copy()
+    routes.loc[0, "Source airport"] = None
+    routes.loc[1, "Destination airport"] = "BBB"  # BBB -> BBB
+    routes["Source airport"] = routes["Source airport"].astype("category")
+    index = AirportIndex(routes, lounges)
+    assert "nan" not in index.airports and "None" not in index.airports
+    assert index.route_positions("BBB").tolist() == [0, 1, 3, 5]
+
+
+def test_location_is_none_without_coordinates(routes, lounges):
+    index = AirportIndex(routes, lounges)
+    assert index.location("AAA")[:2] == (0.0, 0.0)
+    assert index.location("FFF") is None  # lounge row without coordinates
+    assert index.location("DDD") is None  # no lounge row at all
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+import data_store
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, "CACHE_DIR", str(tmp_path / "cache"))
+
+
+def test_parquet_file_is_used_as_is(tmp_path, routes):
+    path = tmp_path / "routes.parquet"
+    routes.to_parquet(path, index=False)
+    assert data_store.snapshot_for(str(path)) == str(path)
+    pd.testing.assert_frame_equal(data_store.load_table(str(path)), routes)
+
+
+def test_csv_named_parquet_is_converted(tmp_path, routes):
+    path = tmp_path / "routes.parquet"
+    routes.to_csv(path, index=False)
+    snapshot = data_store.snapshot_for(str(path))
+    assert snapshot != str(path)
+    assert data_store.is_parquet(snapshot)
+    loaded = data_store.load_table(str(path), columns=["Airline", "Source airport"])
+    pd.testing.assert_frame_equal(loaded, routes[["Airline", "Source airport"]])
+
+
+def test_snapshot_reused_until_file_changes(tmp_path, routes):
+    path = tmp_path / "routes.csv"
+    routes.to_csv(path, index=False)
+    first = data_store.snapshot_for(str(path))
+    assert data_store.snapshot_for(str(path)) == first
+    routes.head(2).to_csv(path, index=False)
+    assert data_store.snapshot_for(str(path)) != first
+    assert len(data_store.load_table(str(path))) == 2
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from itinerary import RouteGraph
+from route_matching import RouteIndex
+from spatial_index import haversine_km
+
+
+@pytest.fixture
+def graph(routes):
+    return RouteGraph(RouteIndex.from_routes(routes))
+
+
+def test_shortest_itinerary_per_number_of_stops(graph):
+    result = graph.itineraries("AAA", "DDD")
+    assert result["Stops"].tolist() == [2]
+    assert result.loc[0, "Itinerary"] == "AAA → BBB → CCC → DDD"
+    assert result.loc[0, "Distance (km)"] == pytest.approx(float(haversine_km(0.0, 0.0, 0.0, 30.0)), abs=0.1)
+    assert graph.itineraries("AAA", "DDD", max_stops=1).empty
+
+
+def test_direct_and_connecting_itineraries_sorted_by_cost(graph):
+    result = graph.itineraries("BBB", "DDD")
+    assert result["Itinerary"].tolist() == ["BBB → CCC → DDD"]
+    assert result.loc[0, "Lounge Connections"] == 0
+    assert graph.itineraries("AAA", "BBB")["Stops"].tolist() == [0]
+
+
+def test_preferred_lounges_reroute_through_their_airports(graph):
+    detour = graph.itineraries("AAA", "DDD", preferred=["BBB", "EEE"], penalty_km=2000)
+    assert detour.loc[0, "Itinerary"] == "AAA → BBB → EEE → DDD"
+    assert detour.loc[0, "Lounge Connections"] == 2
+    # A small penalty is not worth the longer route
+    direct = graph.itineraries("AAA", "DDD", preferred=["BBB", "EEE"], penalty_km=100)
+    assert direct.loc[0, "Itinerary"] == "AAA → BBB → CCC → DDD"
+    assert direct.loc[0, "Lounge Connections"] == 1
+
+
+def test_unknown_or_same_airport_has_no_itinerary(graph):
+    assert graph.itineraries("AAA", "ZZZ").empty
+    assert graph.itineraries("AAA", "AAA").empty
+    # Routes are directed
+    assert graph.itineraries("DDD", "AAA").empty
+
+
+def test_legs_of_an_itinerary(graph):
+    legs = graph.legs("AAA → BBB → EEE")
+    assert legs["Source airport"].tolist() == ["AAA", "BBB"]
+    assert legs["Destination airport"].tolist() == ["BBB", "EEE"]
+    assert legs["Destination Latitude"].tolist() == [0.0, 10.0]
+
+
+def test_missing_coordinates_do_not_overwrite_known_ones(routes):
+    # A later route row into CCC with no coordinates must not blank out CCC's position
+    broken = pd.concat([routes, routes.iloc[[4]].assign(**{"Destination airport": "CCC", "Destination Latitude": np.nan})])
+    graph = RouteGraph(RouteIndex.from_routes(broken))
+    assert (graph.lat[graph.code("CCC")], graph.lon[graph.code("CCC")]) == (0.0, 20.0)
+    result = graph.itineraries("AAA", "DDD")
+    assert result["Distance (km)"].notna().all()
@@ -0,0 +1,40 @@
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from lounge_cube import LoungeCube
+from pipeline import count_columns
+
+
+def test_slice_counts_lounges_per_airport(lounges):
+    lounges = lounges.assign(IATA_Airport=lounges["IATA Code"] + " - " + lounges["Airport Name"])
+    pivot = LoungeCube(lounges).slice(lounge_name="Club")
+    assert pivot.loc["Club"].sum() == 3
+    assert "Plaza" not in pivot.index
+
+
+def test_count_columns_scale_to_each_column():
+    frame = pd.DataFrame({"a": [0, 1, 4], "b": [0, 0, 0]})
+    config = count_columns(frame)
+    assert config["a"]["type_config"]["max_value"] == 4
+    assert config["b"]["type_config"]["max_value"] == 1
+    assert count_columns(frame.iloc[:0]).keys() == {"a", "b"}
+
+
+def test_large_pivot_is_sent_well_under_100_ms():
+    rng = np.random.default_rng(0)
+    pivot = pd.DataFrame(
+        rng.integers(0, 5, (60, 400)),
+        index=pd.Index([f"Lounge {i}" for i in range(60)], name="Lounge Name"),
+        columns=pd.Index([f"A{i:03d} - Airport {i}" for i in range(400)], name="IATA_Airport"),
+    )
+    for frame in (pivot, pivot.T):
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            st.dataframe(frame, column_config=count_columns(frame))
+            timings.append(time.perf_counter() - started)
+        # Best of three, so Streamlit's one-off lazy imports are not counted
+        assert min(timings) < 0.1
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+import streamlit as st
+
+import data_store
+import pipeline
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, "CACHE_DIR", str(tmp_path / "cache"))
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    yield
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def write(path, frame, mtime):
+    frame.to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))
+
+
+def test_changed_data_gets_a_new_key_and_fresh_results(tmp_path, lounges):
+    path = str(tmp_path / "lounges.csv")
+    write(path, lounges, 1_000_000)
+    key = pipeline.data_key(path)
+    assert pipeline.data_key(path) == key
+    assert len(pipeline.filter_lounges(key, (), "Club")) == 3
+
+    write(path, lounges[lounges["IATA Code"] != "AAA"], 2_000_000)
+    new_key = pipeline.data_key(path)
+    assert new_key[0] == key[0] and new_key != key
+    assert len(pipeline.filter_lounges(new_key, (), "Club")) == 2
+    assert pipeline.lounge_options(new_key)[0] == ["BBB - Bravo", "EEE - Echo", "FFF - Foxtrot"]
+
+
+def test_cached_tables_are_returned_as_copies(tmp_path, lounges):
+    path = str(tmp_path / "lounges.csv")
+    write(path, lounges, 1_000_000)
+    key = pipeline.data_key(path)
+    first = pipeline.filter_lounges(key, (), "All")
+    first["Lounge Name"] = "changed"
+    assert "changed" not in pipeline.filter_lounges(key, (), "All")["Lounge Name"].tolist()
+
+
+def test_nearby_lounges_without_position(tmp_path, lounges):
+    path = str(tmp_path / "lounges.csv")
+    write(path, lounges, 1_000_000)
+    key = pipeline.data_key(path)
+    assert pipeline.nearby_lounges(key, "FFF", 500) is None
+    nearby, location = pipeline.nearby_lounges(key, "AAA", 1200)
+    assert location == (0.0, 0.0)
+    assert nearby["IATA Code"].tolist() == ["AAA", "BBB"]
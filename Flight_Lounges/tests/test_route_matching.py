@@ -0,0 +1,92 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from route_matching import RouteIndex, group_route_chunks, group_routes
+
+
+def original_filter(routes_grouped, selected_iata_codes):
+    # The dashboard's filter before RouteIndex: sorted tuples for two or more airports, isin otherwise
+    if len(selected_iata_codes) > 1:
+        possible_routes = {tuple(sorted(pair)) for pair in combinations(selected_iata_codes, 2)}
+        route_tuple = routes_grouped.apply(
+            lambda row: tuple(sorted((row["Source airport"], row["Destination airport"]))), axis=1
+        )
+        return routes_grouped[route_tuple.apply(lambda x: x in possible_routes)]
+    return routes_grouped[
+        routes_grouped["Source airport"].isin(selected_iata_codes)
+        | routes_grouped["Destination airport"].isin(selected_iata_codes)
+    ]
+
+
+def matched(index, selected):
+    return index.among(selected) if len(selected) > 1 else index.touching(selected)
+
+
+@pytest.fixture
+def random_routes():
+    rng = np.random.default_rng(0)
+    codes = np.array([f"A{i:02d}" for i in range(40)])
+    routes = pd.DataFrame({
+        "Airline": "XX",
+        "Source airport": rng.choice(codes, 600),
+        "Destination airport": rng.choice(codes, 600),
+    })
+    for column in ("Source Latitude", "Source Longitude", "Destination Latitude", "Destination Longitude"):
+        routes[column] = rng.uniform(-50, 50, 600)
+    return routes
+
+
+@pytest.mark.parametrize("selected", [
+    [],
+    ["BBB"],
+    ["BBB", "CCC"],
+    ["AAA", "BBB", "EEE", "ZZZ"],
+    ["AAA", "BBB", "CCC", "DDD", "EEE"],  # "All": every airport with a lounge row
+])
+def test_matches_original_filter(routes, selected):
+    grouped = group_routes(routes)
+    index = RouteIndex(grouped)
+    pd.testing.assert_frame_equal(
+        matched(index, selected).reset_index(drop=True),
+        original_filter(grouped, selected).reset_index(drop=True),
+    )
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 5, 20, 40])
+def test_matches_original_filter_on_random_routes(random_routes, size):
+    grouped = group_routes(random_routes)
+    index = RouteIndex(grouped)
+    selected = list(np.random.default_rng(size).choice(index.airports, size, replace=False))
+    pd.testing.assert_frame_equal(
+        matched(index, selected).reset_index(drop=True),
+        original_filter(grouped, selected).reset_index(drop=True),
+    )
+
+
+def test_pair_lookup_and_mask_agree(random_routes):
+    index = RouteIndex.from_routes(random_routes)
+    for size in (2, 10, 40):
+        selected = list(index.airports[:size])
+        np.testing.assert_array_equal(index.among_positions(selected), np.flatnonzero(index.among_mask(selected)))
+
+
+def test_missing_codes_are_not_airports(routes):
+    broken = pd.concat([
+        routes,
+        routes.head(2).assign(**{"Source airport": [None, np.nan]}),
+        routes.head(1).assign(**{"Destination airport": [None]}),
+    ], ignore_index=True)
+    streamed = group_route_chunks([broken.iloc[:4].copy(), broken.iloc[4:].copy()])
+    assert {"nan", "None"}.isdisjoint(streamed["Source airport"]) and {"nan", "None"}.isdisjoint(streamed["Destination airport"])
+    assert streamed["Route Count"].sum() == len(routes)
+    pd.testing.assert_frame_equal(
+        streamed.drop(columns="Route Count").sort_values(["Source airport", "Destination airport"]).reset_index(drop=True),
+        group_routes(routes).astype({"Source airport": str, "Destination airport": str}),
+    )
+
+    index = RouteIndex(broken)
+    assert list(index.airports) == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+    assert len(index) == len(routes)
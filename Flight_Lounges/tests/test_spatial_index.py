@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from spatial_index import GridIndex, haversine_km, map_view
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(-90, 90, 5000)
+    lon = rng.uniform(-180, 180, 5000)
+    # Points right on the antimeridian and poles, and some without coordinates
+    lat[:6] = [0.0, 10.0, -10.0, 89.9, -89.9, 45.0]
+    lon[:6] = [180.0, -180.0, 179.99, 0.0, 120.0, -179.99]
+    lat[6:20] = np.nan
+    return lat, lon, GridIndex(lat, lon)
+
+
+def brute_bbox(lat, lon, south, west, north, east):
+    inside_lat = (lat >= south) & (lat <= north)
+    if west <= east:
+        inside_lon = (lon >= west) & (lon <= east)
+    else:
+        inside_lon = (lon >= west) | (lon <= east)
+    return np.flatnonzero(inside_lat & inside_lon)
+
+
+@pytest.mark.parametrize("box", [
+    (-10.0, -20.0, 10.0, 20.0),
+    (30.0, 100.0, 60.0, 140.5),
+    (-5.0, 170.0, 15.0, -170.0),  # crosses the antimeridian
+    (-5.0, 170.0, 15.0, 190.0),  # Leaflet's unwrapped longitudes past 180
+    (-5.0, -190.0, 15.0, -170.0),
+    (-90.0, -180.0, 90.0, 180.0),
+])
+def test_bbox_matches_brute_force(points, box):
+    lat, lon, grid = points
+    south, west, north, east = box
+    if east > 180:
+        west, east = west, east - 360
+    elif west < -180:
+        west = west + 360
+    np.testing.assert_array_equal(grid.within_bbox(*box), brute_bbox(lat, lon, south, west, north, east))
+
+
+def test_bbox_wider_than_the_world_keeps_everything(points):
+    lat, lon, grid = points
+    assert len(grid.within_bbox(-90, -400, 90, 400)) == np.count_nonzero(~np.isnan(lat))
+
+
+@pytest.mark.parametrize("center", [(0.0, 0.0), (0.0, 179.5), (10.0, -179.9), (60.0, 170.0), (-85.0, 0.0), (89.5, 90.0)])
+@pytest.mark.parametrize("radius_km", [50.0, 500.0, 3000.0])
+def test_radius_matches_brute_force(points, center, radius_km):
+    lat, lon, grid = points
+    positions, distance = grid.within_radius(*center, radius_km)
+
+    all_distance = haversine_km(center[0], center[1], lat, lon)
+    expected = np.flatnonzero(all_distance <= radius_km)
+    np.testing.assert_array_equal(np.sort(positions), expected)
+    np.testing.assert_allclose(distance, all_distance[positions])
+    assert np.all(np.diff(distance) >= 0)
+
+
+def test_haversine_km():
+    assert haversine_km(0.0, 0.0, 0.0, 1.0) == pytest.approx(111.195, abs=0.01)
+    assert haversine_km(0.0, 179.5, 0.0, -179.5) == pytest.approx(111.195, abs=0.01)
+
+
+def test_map_view_without_points():
+    assert map_view([np.nan], [np.nan]) == ({"lat": 0.0, "lon": 0.0}, 0)
+    center, zoom = map_view([0.0, 10.0], [0.0, 20.0])
+    assert center == {"lat": 5.0, "lon": 10.0} and 0 < zoom < 10
@@ -3,8 +3,17 @@ import datetime
 import pandas as pd
 import plotly.express as px
 import ast
-import requests
-from io import BytesIO
+import os
+import sys
+from filters import ScheduleIndex
+from stadiums import stadium_summary
+from trip_planner import TripPlanner, summarize_trips
+from window_counts import WindowCounts
+from schedule import REMOTE_TTL, load_seasons, seasons_in_window, sync_partitions
+
+# instrumentation.py is shared by the apps and lives at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from instrumentation import Profiler
 
 
 #%%
@@ -13,7 +22,9 @@ from io import BytesIO
 st.set_page_config(layout="wide",initial_sidebar_state="expanded")
 #Formatting for Markdown
 st.title("MLB Games This Season")
-st.markdown("This is a dahsboard to map out the homes games within the *2024 MLB baseball season.* You can sort by team, state and date to find the ideal game based on geography.")
+#Per-stage timings, shown in the sidebar with ?profile=1 (see instrumentation.py)
+profiler = Profiler.from_environment("MLB")
+st.markdown("This is a dahsboard to map out the homes games within the *MLB baseball seasons* available, starting with the *2024 season.* You can sort by season, team, state and date to find the ideal game based on geography.")
 
 
 
@@ -24,12 +35,21 @@ st.markdown("This is a dahsboard to map out the homes games within the *2024 MLB
 #Check if data is avaialble 
 # #if not Get the Data
 #modify data as needed
+#Schedule is read local-first and stored as one typed Parquet partition per season (see schedule.py).
+#Only the seasons overlapping the selected dates are loaded, each set once and shared across
+#reruns and sessions, so reruns do no network I/O or date parsing.
+@st.cache_resource(ttl=REMOTE_TTL or None)
+def season_manifest():
+    return sync_partitions()
+
+#The date-sorted schedule and its filter indexes are built once per set of seasons (see filters.py).
+@st.cache_resource(max_entries=8)
+def load_games(seasons):
+    return ScheduleIndex(load_seasons(seasons))
+
 try:
-    CSV = '1aPOm3oFMmz0nUgGhBVGEwucAKIdokC-p'
-    csv_url = f'https://drive.google.com/uc?export=download&id={CSV}'
-    file = requests.get(csv_url)
-    bytesio = BytesIO(file.content)
-    games = pd.read_csv(bytesio)
+    manifest = season_manifest()
+    all_seasons = sorted(int(season) for season in manifest['seasons'])
 except:
     st.text("DATA ERROR")
     
@@ -38,48 +58,42 @@ except:
 #mlb_data = requests.get(DATA_URL)
 #st.write(mlb_data.content)
 
-try:
-    games=games.drop(columns=['Unnamed: 0'])
-except:
-    games=games
-    
-#st.dataframe(games)
-    
-games['Full Date']=games['Date']
-games['Date'] = pd.to_datetime(games['Date'], format='%A, %B %d, %Y')
-cols = games.columns.tolist()
-cols = cols[-1:] + cols[:-1]
-games = games[cols]
+#Season-to-date 'Cumulative Games' per home team is precomputed with the schedule (see schedule.py)
 
-# Create a new DataFrame to store cumulative counts
-cumulative_counts_df = pd.DataFrame(columns=['Date', 'Home Team', 'Cumulative Games'])
-
-# Iterate over unique teams
-for team in games['Home Team'].unique():
-    team_df = games[games['Home Team'] == team].sort_values('Date')
-    team_df['Cumulative Games'] = range(1, len(team_df) + 1)
-    cumulative_counts_df = pd.concat([cumulative_counts_df, team_df])
-
-
-team = games['Home Team'].drop_duplicates()
 
 #%%
 #functions
 
-def datafilter(df):
-    #Home Team
-    df = df[df['Home Team'].str.contains('|'.join(team))]
-    #Dates
+def seasons_selected():
+    #Seasons picked in the sidebar (all if none) that overlap the date window
+    return seasons_in_window(manifest, d1, d2, seasons=season or all_seasons)
+
+def datafilter(schedule):
+    #Row positions of the games matching the date window, teams and US states.
+    #Exact matches; an empty team/state selection keeps everything
     start_date = pd.to_datetime(d1)
     end_date = pd.to_datetime(d2)
-    df=df[df['Date'].between(start_date, end_date)]
-    #US State
-    df=df[df['State'].str.contains('|'.join(us_state))]
-    
-    #reset delta
-    delta=start_date-end_date
-    min_date=start_date
-    return df
+    return schedule.positions(start_date, end_date, teams=team, states=us_state)
+
+#Per-day prefix sums of home games and matchups, built once per set of seasons (see window_counts.py).
+#Any date window is then the difference of two day slices, so sliding the window is cheap
+@st.cache_resource(max_entries=8)
+def window_counts(seasons):
+    return WindowCounts(load_games(seasons))
+
+@st.cache_data(max_entries=32)
+def stadium_counts(seasons, positions):
+    return stadium_summary(load_games(seasons).take(positions))
+
+#Stadium distance matrix and the games of a set of seasons, built once per set
+@st.cache_resource(max_entries=8)
+def trip_planner(seasons):
+    return TripPlanner(load_games(seasons).games)
+
+def jump_to_season():
+    #Move the start date to the first selected season when the season selection changes
+    selected = st.session_state.season or all_seasons
+    st.session_state.min_date = datetime.date.fromisoformat(manifest['seasons'][str(min(selected))]['start'])
 
 def increment_week():
     st.session_state.min_date= pd.to_datetime(d1)
@@ -87,11 +101,13 @@ def increment_week():
 
 #%%
 #Session State
+#Default to the start of the latest season
+latest_start = datetime.date.fromisoformat(manifest['seasons'][str(all_seasons[-1])]['start'])
 if 'ult_min_date' not in st.session_state:
-    st.session_state.ult_min_date = games['Date'].min()
+    st.session_state.ult_min_date = datetime.date.fromisoformat(manifest['seasons'][str(all_seasons[0])]['start'])
 
 if 'min_date' not in st.session_state:
-    st.session_state.min_date = games['Date'].min()
+    st.session_state.min_date = latest_start
     min_date=st.session_state.min_date
     
 if 'delta' not in st.session_state:
@@ -104,6 +120,14 @@ if 'delta' not in st.session_state:
 #Get the Sidebar with calendar
 with st.sidebar:
     
+    season = st.multiselect(
+        'Select Season',
+        all_seasons,
+        default=all_seasons[-1:],
+        key='season',
+        on_change=jump_to_season
+    )
+    
     d1 = st.date_input(
         "Start Date",
         st.session_state.min_date,
@@ -122,83 +146,129 @@ with st.sidebar:
                 '  <br> to <br> ' + 
                 "**"+ d2.strftime("%A, %B %d, %Y") + "**",
                 unsafe_allow_html=True)
+    #Options come from the manifest so no games are read to build the widgets
+    season_info = [manifest['seasons'][str(s)] for s in (season or all_seasons)]
     team = st.multiselect(
         'Select Team',
-        (games['Home Team'].drop_duplicates().sort_values())
+        sorted({t for info in season_info for t in info['teams']})
     )
     
     us_state=st.multiselect(
         'Select US State',
-        games['State'].drop_duplicates().sort_values()
+        sorted({state for info in season_info for state in info['states']})
     )
     
     # Increment the date forward by 1 week when the button is clicked
     st.button('Next Week', on_click=increment_week)
     #games=st.button('Reset',on_click=reset_data,type='primary')
     
-games=datafilter(games)
-cumulative_counts_df=datafilter(cumulative_counts_df)
+#Load only the season partitions the window touches, then filter.
+#Filtered row positions are shared by every chart below
+with profiler.stage('load') as stage:
+    seasons=seasons_selected()
+    schedule=load_games(seasons)
+    stage.rows_out = len(schedule.games)
+with profiler.stage('datafilter', rows_in=len(schedule.games)) as stage:
+    positions=datafilter(schedule)
+    games=schedule.take(positions)
+    stage.rows_out = len(games)
+counts=window_counts(seasons)
 
 #%%
 #Dashboard Elements
 
 #expander with raw data
 with st.expander('Open for Raw Data'):
-    st.dataframe(games)
+    profiler.dataframe('raw data table', games)
 #st.map(homegames,latitude='LAT',longitude='LON')
 
-map_games = px.scatter_mapbox(games, 
-                        lat = 'Home Team Lat',
-                        lon = 'Home Team Long', 
-                        color = 'Home Team',
-                        zoom=2.5,
-                        mapbox_style = 'carto-darkmatter')
-st.plotly_chart(map_games, use_container_width=True)
-
-tab1, tab2, tab3 = st.tabs(["Heatmap of Games","Distribution of Games", "Cumulative Games"])
+#One marker per ballpark, sized by the number of games in the window
+with profiler.stage('stadium map build', rows_in=len(games)) as stage:
+    stadiums = stadium_counts(seasons, positions)
+    stage.rows_out = len(stadiums)
+    map_games = px.scatter_mapbox(stadiums, 
+                            lat = 'Home Team Lat',
+                            lon = 'Home Team Long', 
+                            color = 'Home Team',
+                            size = 'Games',
+                            size_max = 30,
+                            hover_name = 'Home Team',
+                            hover_data = {'Games': True, 'Next Game': True, 'Last Game': True, 'Opponents': True,
+                                          'Home Team': False, 'Home Team Lat': False, 'Home Team Long': False},
+                            zoom=2.5,
+                            mapbox_style = 'carto-darkmatter')
+profiler.plotly_chart('stadium map', map_games, use_container_width=True)
+
+tab1, tab2, tab3, tab4 = st.tabs(["Heatmap of Games","Distribution of Games", "Cumulative Games", "Road Trip Planner"])
 with tab1:
-   # Create a new DataFrame for heatmap
-    heatmap_df = pd.DataFrame(columns=['Team', 'Opponent', 'Count'])
-
-    # Iterate through each row and count occurrences of home and away teams
-    for _, row in games.iterrows():
-        # Home team
-        heatmap_df = pd.concat([heatmap_df, pd.DataFrame({'Team': [row['Home Team']], 'Opponent': [row['Away Team']], 'Count': [1]})], ignore_index=True)
-        # Away team
-        heatmap_df = pd.concat([heatmap_df, pd.DataFrame({'Team': [row['Away Team']], 'Opponent': [row['Home Team']], 'Count': [1]})], ignore_index=True)
-
-    # Group by team and opponent and sum the counts
-    heatmap_df = heatmap_df.groupby(['Team', 'Opponent']).sum().reset_index()
-
-    # Create a pivot table for the heatmap
-    heatmap_pivot = heatmap_df.pivot(index='Team', columns='Opponent', values='Count').fillna(0)
-
-    # Create heatmap using Plotly
-    fig = px.imshow(heatmap_pivot.values,
-                    labels=dict(color='Count'),
-                    x=heatmap_pivot.columns,
-                    y=heatmap_pivot.index,
-                    color_continuous_scale='Viridis')
-
-    # Customize the layout if needed
-    fig.update_layout(
-        title='Home vs Away Teams Heatmap',
-        xaxis_title='Opponent',
-        yaxis_title='Team'
-    )
+    # Team x Opponent counts for the window, from the prefix sums
+    with profiler.stage('heatmap build', rows_in=len(games)) as stage:
+        heatmap_pivot = counts.matchups(d1, d2, teams=team, states=us_state)
+        stage.rows_out = len(heatmap_pivot)
+
+        # Create heatmap using Plotly
+        fig = px.imshow(heatmap_pivot.values,
+                        labels=dict(color='Count'),
+                        x=heatmap_pivot.columns,
+                        y=heatmap_pivot.index,
+                        color_continuous_scale='Viridis')
+
+        # Customize the layout if needed
+        fig.update_layout(
+            title='Home vs Away Teams Heatmap',
+            xaxis_title='Opponent',
+            yaxis_title='Team'
+        )
    
-    st.plotly_chart(fig, theme="streamlit", use_container_width=True)
+    profiler.plotly_chart('heatmap', fig, theme="streamlit", use_container_width=True)
 with tab2:
     # Use the Streamlit theme.
     # This is the default. So you can also omit the theme argument.
-    fig=px.pie(games,names='Home Team')
-    st.plotly_chart(fig, theme="streamlit", use_container_width=True)
+    with profiler.stage('distribution build', rows_in=len(games)):
+        fig=px.pie(counts.home_games(d1, d2, teams=team, states=us_state),names='Home Team',values='Games')
+    profiler.plotly_chart('distribution', fig, theme="streamlit", use_container_width=True)
 with tab3:
-    # Use the native Plotly theme.
-    fig=px.line(cumulative_counts_df,x='Date',y='Cumulative Games',color='Home Team')
-    st.plotly_chart(fig, theme="streamlit", use_container_width=True)
-
-
+    # Season-to-date counts come with the schedule; window counts restart at the start date
+    count_in_window = st.toggle('Count games from the start of the selected window')
+    with profiler.stage('cumulative build', rows_in=len(games)):
+        # Filtered games are already in date order
+        cumulative_counts_df = games
+        if count_in_window:
+            cumulative_counts_df = games.assign(**{'Cumulative Games': counts.cumulative_in_window(positions, d1, states=us_state)})
+        # Use the native Plotly theme.
+        fig=px.line(cumulative_counts_df,x='Date',y='Cumulative Games',color='Home Team')
+    profiler.plotly_chart('cumulative', fig, theme="streamlit", use_container_width=True)
+with tab4:
+    # Trips that attend the most games (or ballparks) within a daily driving limit
+    c1, c2, c3, c4 = st.columns(4)
+    trip_start = c1.date_input('Trip Start', d1, format="DD.MM.YYYY")
+    trip_days = c2.number_input('Trip Length (days)', 1, 60, min(delta, 14))
+    max_miles = c3.number_input('Max Driving per Day (miles)', 50, 2000, 300, step=50)
+    objective = c4.radio('Maximize', ['games', 'ballparks'], format_func=str.title)
+
+    trip_end = trip_start + datetime.timedelta(days=int(trip_days) - 1)
+    trip_seasons = seasons_in_window(manifest, trip_start, trip_end)
+    with profiler.stage('trip planning') as stage:
+        trips = trip_planner(trip_seasons).plan(trip_start, int(trip_days), max_miles, objective=objective)
+        stage.rows_out = len(trips)
+
+    if not trips:
+        st.write('No games scheduled in this period.')
+    else:
+        st.dataframe(summarize_trips(trips), hide_index=True, use_container_width=True)
+        best_trip = trips[0]
+        st.dataframe(best_trip.drop(columns=['Home Team Lat', 'Home Team Long']), hide_index=True, use_container_width=True)
+        fig=px.line_mapbox(best_trip,
+                           lat='Home Team Lat',
+                           lon='Home Team Long',
+                           hover_name='Home Team',
+                           hover_data=['Date', 'Away Team'],
+                           zoom=3,
+                           mapbox_style='carto-darkmatter')
+        fig.update_traces(mode='lines+markers')
+        profiler.plotly_chart('trip map', fig, use_container_width=True)
+
+profiler.panel()
 
 
 #st.write(d)
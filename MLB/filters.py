@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+
+class ScheduleIndex:
+    """
+    Date-sorted schedule with code indexes for the dashboard filters.
+
+    The date window is two ``searchsorted`` calls on the sorted dates, and
+    team/state membership is a lookup of each row's category code in a small
+    boolean table, so a filter returns exact row positions into ``games``
+    without scanning strings. Those positions are shared by every chart.
+    """
+
+    def __init__(self, games):
+        self.games = games.sort_values("Date", kind="stable").reset_index(drop=True)
+        self.dates = self.games["Date"].to_numpy(dtype="datetime64[ns]")
+
+        home = self.games["Home Team"].astype("category")
+        state = self.games["State"].astype("category")
+        self.teams = home.cat.categories
+        self.states = state.cat.categories
+        self.team_codes = home.cat.codes.to_numpy()
+        self.state_codes = state.cat.codes.to_numpy()
+
+    def window(self, start, end):
+        """(lo, hi) slice of the rows dated start..end, both inclusive."""
+        lo = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start), "ns"), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end), "ns"), side="right")
+        return lo, hi
+
+    @staticmethod
+    def _member(categories, codes, selected):
+        # Slot 0 holds missing values (code -1), which never match a selection
+        lookup = np.zeros(len(categories) + 1, dtype=bool)
+        found = categories.get_indexer(pd.Index(list(selected), dtype=object))
+        lookup[found[found >= 0] + 1] = True
+        return lookup[codes + 1]
+
+    def positions(self, start, end, teams=(), states=()):
+        """
+        Row positions of home games between start and end (inclusive) for
+        the given home teams and states; an empty selection means all.
+        """
+        lo, hi = self.window(start, end)
+        keep = np.ones(hi - lo, dtype=bool)
+        if len(teams):
+            keep &= self._member(self.teams, self.team_codes[lo:hi], teams)
+        if len(states):
+            keep &= self._member(self.states, self.state_codes[lo:hi], states)
+        return lo + np.flatnonzero(keep)
+
+    def take(self, positions):
+        return self.games.iloc[positions]
@@ -0,0 +1,242 @@
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+import requests
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+# Schedule bundled with the repo, used until a remote copy has been fetched
+LOCAL_CSV = os.path.join(DATA_DIR, "MLB Games.csv")
+REMOTE_ID = "1aPOm3oFMmz0nUgGhBVGEwucAKIdokC-p"
+REMOTE_URL = f"https://drive.google.com/uc?export=download&id={REMOTE_ID}"
+
+# Shared by every session (and every replica mounting the same directory)
+CACHE_DIR = os.environ.get("MLB_CACHE_DIR", os.path.join(DATA_DIR, ".cache"))
+# Seconds between conditional GETs of the remote schedule, 0 disables the remote
+REMOTE_TTL = int(os.environ.get("MLB_SCHEDULE_TTL", 6 * 3600))
+
+# Bump when the derived columns of the partitions change
+SNAPSHOT_VERSION = 3
+
+DATE_FORMAT = "%A, %B %d, %Y"
+CATEGORY_COLUMNS = ["Away Team", "Home Team", "State"]
+FLOAT32_COLUMNS = ["Away Team Lat", "Away Team Long", "Home Team Lat", "Home Team Long"]
+
+SEASONS_DIR = os.path.join(CACHE_DIR, "seasons")
+MANIFEST = os.path.join(SEASONS_DIR, "manifest.json")
+REMOTE_CSV = os.path.join(CACHE_DIR, "remote.csv")
+REMOTE_META = os.path.join(CACHE_DIR, "remote.json")
+
+
+def _atomic_write(path, write):
+    # Write next to the target then rename, so readers never see a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _read_meta():
+    try:
+        with open(REMOTE_META) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(meta):
+    def write(tmp):
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+    _atomic_write(REMOTE_META, write)
+
+
+def refresh_remote(url=REMOTE_URL, ttl=REMOTE_TTL):
+    """
+    Keep a local copy of the remote schedule CSV up to date.
+
+    Does nothing within ``ttl`` seconds of the last check; after that sends
+    a conditional GET (ETag / Last-Modified). Network errors keep whatever
+    copy is already on disk. Returns the path of the remote copy, or None if
+    there is none.
+    """
+    if ttl <= 0:
+        return None
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    meta = _read_meta()
+    have_copy = os.path.exists(REMOTE_CSV)
+    if have_copy and time.time() - meta.get("checked_at", 0) < ttl:
+        return REMOTE_CSV
+
+    headers = {}
+    if have_copy:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=15)
+        if response.status_code != 304:
+            response.raise_for_status()
+            def write(tmp):
+                with open(tmp, "wb") as f:
+                    f.write(response.content)
+            _atomic_write(REMOTE_CSV, write)
+            meta = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        meta["checked_at"] = time.time()
+        _write_meta(meta)
+    except (requests.RequestException, OSError):
+        pass
+    return REMOTE_CSV if os.path.exists(REMOTE_CSV) else None
+
+
+def schedule_sources():
+    """
+    Every schedule CSV, oldest precedence first: the CSVs bundled under
+    data/ (one or more seasons each) and then the remote copy, if fetched.
+    """
+    sources = sorted(glob.glob(os.path.join(DATA_DIR, "*.csv")))
+    remote = refresh_remote()
+    if remote:
+        sources.append(remote)
+    return sources
+
+
+def parse_schedule(path):
+    """Read a schedule CSV into the typed frame the dashboard uses."""
+    games = pd.read_csv(path)
+    games = games.drop(columns=[c for c in games.columns if c.startswith("Unnamed")])
+
+    games.insert(0, "Full Date", games["Date"])
+    games["Date"] = pd.to_datetime(games["Date"], format=DATE_FORMAT)
+    # Spring training through the postseason all fall in one calendar year
+    games.insert(2, "Season", games["Date"].dt.year.astype("int16"))
+    for column in CATEGORY_COLUMNS:
+        games[column] = games[column].astype("category")
+    for column in FLOAT32_COLUMNS:
+        games[column] = games[column].astype("float32")
+    return games
+
+
+def cumulative_home_games(games):
+    """Running count of each team's home games in date order (1 for the first), per season."""
+    ordered = games.sort_values("Date", kind="stable")
+    keys = ["Season", "Home Team"] if "Season" in games.columns else ["Home Team"]
+    return ordered.groupby(keys, observed=True).cumcount().add(1).reindex(games.index)
+
+
+def add_cumulative_games(games):
+    games["Cumulative Games"] = cumulative_home_games(games).astype("int32")
+    return games
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _partition_path(season):
+    return os.path.join(SEASONS_DIR, f"season={season}", "games.parquet")
+
+
+def sync_partitions():
+    """
+    Make sure every season of the schedule sources is stored as its own
+    Parquet partition and return the manifest describing them.
+
+    Sources are re-parsed only when their content hashes change. A season
+    found in several sources is taken from the last one (the remote copy
+    wins over the bundled CSV). The manifest lists, per season, its date
+    range, row count, teams and states, so the dashboard can build its
+    widgets and pick partitions without reading any games.
+    """
+    sources = schedule_sources()
+    fingerprint = [SNAPSHOT_VERSION] + [_file_hash(path) for path in sources]
+    try:
+        with open(MANIFEST) as f:
+            manifest = json.load(f)
+        if manifest.get("fingerprint") == fingerprint and all(
+            os.path.exists(_partition_path(season)) for season in manifest["seasons"]
+        ):
+            return manifest
+    except (OSError, ValueError, KeyError):
+        pass
+
+    seasons = {}
+    for path in sources:
+        games = parse_schedule(path)
+        for season, part in games.groupby("Season"):
+            seasons[int(season)] = part
+    os.makedirs(SEASONS_DIR, exist_ok=True)
+
+    manifest = {"fingerprint": fingerprint, "seasons": {}}
+    for season, part in sorted(seasons.items()):
+        part = add_cumulative_games(part.sort_values("Date", kind="stable").reset_index(drop=True))
+        path = _partition_path(season)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write(path, lambda tmp: part.to_parquet(tmp, index=False))
+        manifest["seasons"][str(season)] = {
+            "start": part["Date"].min().date().isoformat(),
+            "end": part["Date"].max().date().isoformat(),
+            "rows": len(part),
+            "teams": sorted(part["Home Team"].dropna().unique().tolist()),
+            "states": sorted(part["State"].dropna().unique().tolist()),
+        }
+
+    def write(tmp):
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+    _atomic_write(MANIFEST, write)
+    return manifest
+
+
+def seasons_in_window(manifest, start, end, seasons=()):
+    """Seasons (optionally restricted to ``seasons``) whose dates overlap start..end."""
+    start, end = pd.Timestamp(start).date().isoformat(), pd.Timestamp(end).date().isoformat()
+    return tuple(
+        int(season)
+        for season, info in sorted(manifest["seasons"].items())
+        if (not seasons or int(season) in seasons) and info["start"] <= end and info["end"] >= start
+    )
+
+
+def load_seasons(seasons):
+    """Typed schedule made of only the given season partitions."""
+    parts = [pd.read_parquet(_partition_path(season)) for season in seasons]
+    if not parts:
+        return empty_schedule()
+    games = pd.concat(parts, ignore_index=True)
+    # Categories differ between seasons, so concat falls back to object
+    for column in CATEGORY_COLUMNS:
+        games[column] = games[column].astype("category")
+    return games
+
+
+def empty_schedule():
+    """An empty schedule with the typed columns, for windows that match no season."""
+    games = pd.DataFrame({
+        "Full Date": pd.Series(dtype=object),
+        "Date": pd.Series(dtype="datetime64[ns]"),
+        "Season": pd.Series(dtype="int16"),
+    })
+    for column in CATEGORY_COLUMNS:
+        games[column] = pd.Series(dtype="category")
+    for column in FLOAT32_COLUMNS:
+        games[column] = pd.Series(dtype="float32")
+    games["Cumulative Games"] = pd.Series(dtype="int32")
+    return games
@@ -0,0 +1,25 @@
+def stadium_summary(games):
+    """
+    One row per ballpark for the given games: number of home games, first
+    and last game date, and the opponents faced there.
+    """
+    grouped = games.groupby("Home Team", observed=True)
+    summary = grouped.agg(**{
+        "State": ("State", "first"),
+        "Home Team Lat": ("Home Team Lat", "first"),
+        "Home Team Long": ("Home Team Long", "first"),
+        "Games": ("Date", "size"),
+        "Next Game": ("Date", "min"),
+        "Last Game": ("Date", "max"),
+    })
+
+    # Distinct (home, away) pairs first, so the string join only sees each opponent once
+    pairs = games[["Home Team", "Away Team"]].astype(str).drop_duplicates().sort_values(["Home Team", "Away Team"])
+    summary["Opponents"] = pairs.groupby("Home Team")["Away Team"].agg(", ".join).reindex(summary.index.astype(str)).to_numpy()
+
+    # Plain strings: a categorical keeps every team of the season, and Plotly
+    # groups the map colors by all categories, failing on teams with no rows
+    summary.index = summary.index.astype(str)
+    summary["Next Game"] = summary["Next Game"].dt.strftime("%a, %b %d, %Y")
+    summary["Last Game"] = summary["Last Game"].dt.strftime("%a, %b %d, %Y")
+    return summary.reset_index()
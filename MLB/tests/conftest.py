@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules are imported the way Streamlit runs them, from the app folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schedule import LOCAL_CSV, add_cumulative_games, parse_schedule  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def games():
+    """The bundled schedule, typed as in the season partitions."""
+    return add_cumulative_games(parse_schedule(LOCAL_CSV).sort_values("Date", kind="stable").reset_index(drop=True))
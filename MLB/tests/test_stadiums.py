@@ -0,0 +1,19 @@
+import plotly.express as px
+
+from stadiums import stadium_summary
+
+
+def test_summary_lists_only_filtered_teams_as_strings(games):
+    teams = sorted(games["Home Team"].cat.categories)[:5]
+    summary = stadium_summary(games[games["Home Team"].isin(teams)])
+
+    assert sorted(summary["Home Team"]) == teams
+    assert summary["Home Team"].dtype == object
+    assert summary["Games"].sum() == games["Home Team"].isin(teams).sum()
+
+
+def test_summary_maps_with_team_filter(games):
+    # Coloring by team used to fail on the teams filtered out
+    summary = stadium_summary(games[games["Home Team"].isin(games["Home Team"].cat.categories[:5])])
+    fig = px.scatter_mapbox(summary, lat="Home Team Lat", lon="Home Team Long", color="Home Team", size="Games")
+    assert len(fig.data) == 5
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from trip_planner import TripPlanner, haversine_matrix, summarize_trips
+
+
+def game(date, away, home, lat, lon):
+    return {"Date": pd.Timestamp(date), "Away Team": away, "Home Team": home, "State": "XX",
+            "Home Team Lat": lat, "Home Team Long": lon}
+
+
+@pytest.fixture
+def schedule():
+    # A and B are ~69 miles apart, C is far away; D has no coordinates and one game has no home team
+    return pd.DataFrame([
+        game("2024-04-01", "X", "A", 40.0, -75.0),
+        game("2024-04-01", "X", "C", 34.0, -118.0),
+        game("2024-04-02", "Y", "B", 41.0, -75.0),
+        game("2024-04-02", "Y", None, 41.0, -75.0),
+        game("2024-04-03", "Z", "D", np.nan, np.nan),
+        game("2024-04-03", "Z", "A", 40.0, -75.0),
+    ])
+
+
+def test_haversine_matrix():
+    distance = haversine_matrix([40.0, 41.0], [-75.0, -75.0])
+    assert distance[0, 0] == 0.0
+    assert distance[0, 1] == pytest.approx(69.1, abs=0.1)
+
+
+def test_games_without_ballpark_are_left_out(schedule):
+    planner = TripPlanner(schedule)
+    assert list(planner.ballparks) == ["A", "B", "C"]
+    assert len(planner.games) == 4
+    assert (planner.ballpark_codes >= 0).all()
+
+
+def test_plan_prefers_most_games_then_ballparks(schedule):
+    trips = TripPlanner(schedule).plan("2024-04-01", 3, max_daily_miles=100)
+    best = trips[0]
+    assert best["Home Team"].tolist() == ["A", "B", "A"]
+    assert best["Miles From Previous"].tolist() == [0.0, 69.0, 69.0]
+
+    by_parks = TripPlanner(schedule).plan("2024-04-01", 3, max_daily_miles=100, objective="ballparks")[0]
+    assert by_parks["Home Team"].nunique() == 2
+
+    summary = summarize_trips(trips)
+    assert summary.loc[0, "Route"] == "A → B → A"
+    assert summary.loc[0, "Games"] == 3
+
+
+def test_plan_on_bundled_schedule(games):
+    planner = TripPlanner(games)
+    start = games["Date"].min()
+    trips = planner.plan(start, 7, max_daily_miles=300)
+    assert trips
+    for trip in trips:
+        assert trip["Date"].is_monotonic_increasing
+        assert trip["Date"].dt.normalize().is_unique
@@ -0,0 +1,58 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from filters import ScheduleIndex
+from schedule import cumulative_home_games
+from window_counts import WindowCounts
+
+
+@pytest.fixture(scope="module")
+def moved(games):
+    """The schedule with every third Cubs home game played in another state."""
+    games = games.copy()
+    games["State"] = games["State"].astype(object)
+    cubs = np.flatnonzero(games["Home Team"].astype(str) == "Chicago Cubs")
+    games.loc[cubs[::3], "State"] = "MO"
+    return ScheduleIndex(games)
+
+
+def window_positions(schedule, teams=(), states=()):
+    start = schedule.games["Date"].min() + datetime.timedelta(days=30)
+    end = start + datetime.timedelta(days=60)
+    return start, schedule.positions(start, end, teams=teams, states=states)
+
+
+@pytest.mark.parametrize("states", [(), ("IL",), ("IL", "NY", "CA")])
+def test_window_cumulative_matches_filtered_games(moved, states):
+    counts = WindowCounts(moved)
+    start, positions = window_positions(moved, states=states)
+    expected = cumulative_home_games(moved.take(positions).reset_index(drop=True))
+    result = counts.cumulative_in_window(positions, start, states=states)
+    np.testing.assert_array_equal(result, expected.to_numpy())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_window_queries_match_filtered_games(moved, seed):
+    counts = WindowCounts(moved)
+    rng = np.random.default_rng(seed)
+    first = moved.games["Date"].min()
+    start = first + datetime.timedelta(days=int(rng.integers(0, 150)))
+    end = start + datetime.timedelta(days=int(rng.integers(0, 40)))
+    teams = tuple(rng.choice(moved.teams, size=int(rng.integers(0, 4)), replace=False))
+    states = tuple(rng.choice(moved.states, size=int(rng.integers(0, 3)), replace=False))
+    filtered = moved.take(moved.positions(start, end, teams=teams, states=states))
+
+    expected = filtered.groupby("Home Team", observed=True).size()
+    home = counts.home_games(start, end, teams=teams, states=states).set_index("Home Team")["Games"]
+    assert home.to_dict() == expected[expected > 0].to_dict()
+
+    both = pd.concat([
+        filtered[["Home Team", "Away Team"]].set_axis(["Team", "Opponent"], axis=1),
+        filtered[["Away Team", "Home Team"]].set_axis(["Team", "Opponent"], axis=1),
+    ]).astype(str)
+    expected = pd.crosstab(both["Team"], both["Opponent"])
+    result = counts.matchups(start, end, teams=teams, states=states)
+    pd.testing.assert_frame_equal(result, expected, check_names=False, check_dtype=False)
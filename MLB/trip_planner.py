@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def haversine_matrix(lat, lon):
+    """Pairwise great-circle distances in miles between points given in degrees."""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _popcount(x):
+    # SWAR bit count on uint64, vectorized
+    x = x.astype(np.uint64)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
+class TripPlanner:
+    """
+    Road trips over a schedule, attending at most one game per day.
+
+    Ballparks are the home teams' stadiums, with a precomputed haversine
+    distance matrix between them. Games sorted by date form a DAG: game j can
+    follow game i on an earlier day if the straight-line distance between the
+    ballparks is at most ``max_daily_miles`` per day in between. The best trip
+    ending at each game is found with a dynamic program that relaxes one day
+    of games at a time against every earlier game in the window.
+    """
+
+    def __init__(self, games):
+        # A game without a home team or stadium coordinates has no ballpark to travel to
+        games = games.dropna(subset=["Home Team", "Home Team Lat", "Home Team Long"])
+        self.games = games.sort_values("Date", kind="stable").reset_index(drop=True)
+        self.dates = self.games["Date"].to_numpy(dtype="datetime64[D]")
+
+        home = self.games["Home Team"].astype("category").cat.remove_unused_categories()
+        self.ballparks = home.cat.categories
+        self.ballpark_codes = home.cat.codes.to_numpy().astype(np.int64)
+        if len(self.ballparks) > 63:
+            raise ValueError("TripPlanner supports at most 63 ballparks")
+
+        parks = self.games.groupby("Home Team", observed=True)[["Home Team Lat", "Home Team Long"]].first()
+        parks = parks.reindex(self.ballparks)
+        self.distance = haversine_matrix(parks["Home Team Lat"], parks["Home Team Long"])
+
+    def plan(self, start, days, max_daily_miles, objective="games", top=5):
+        """
+        Best trips within ``days`` days from ``start``.
+
+        ``objective`` is "games" (most games attended) or "ballparks" (most
+        distinct ballparks; one best trip is kept per game, so this one is a
+        heuristic). Ties go to the trip with fewer miles. Returns up to ``top``
+        trips, each a DataFrame of the games attended, best first.
+        """
+        first = np.datetime64(pd.Timestamp(start).date(), "D")
+        last = first + np.timedelta64(days - 1, "D")
+        lo = np.searchsorted(self.dates, first, side="left")
+        hi = np.searchsorted(self.dates, last, side="right")
+        n = hi - lo
+        if n == 0:
+            return []
+
+        day = (self.dates[lo:hi] - first).astype(np.int64)
+        park = self.ballpark_codes[lo:hi]
+        bit = np.left_shift(np.uint64(1), park.astype(np.uint64))
+
+        # Best trip ending at each game: games attended, ballparks visited, miles, previous game
+        count = np.ones(n, dtype=np.int64)
+        visited = bit.copy()
+        miles = np.zeros(n)
+        prev = np.full(n, -1, dtype=np.int64)
+
+        def key(primary, secondary, distance):
+            return primary * 1e12 + secondary * 1e6 - distance
+
+        day_starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+        day_ends = np.r_[day_starts[1:], n]
+        for a, b in zip(day_starts, day_ends):
+            if a == 0:
+                continue
+            gap = day[a:b, None] - day[None, :a]
+            leg = self.distance[park[a:b, None], park[None, :a]]
+            feasible = leg <= max_daily_miles * gap
+
+            cand_count = count[None, :a] + 1
+            cand_visited = visited[None, :a] | bit[a:b, None]
+            cand_parks = _popcount(cand_visited)
+            cand_miles = miles[None, :a] + leg
+            if objective == "ballparks":
+                score = key(cand_parks, cand_count, cand_miles)
+            else:
+                score = key(cand_count, cand_parks, cand_miles)
+            score = np.where(feasible, score, -np.inf)
+
+            best = score.argmax(axis=1)
+            rows = np.arange(b - a)
+            own = key(1, 1, 0.0)
+            improve = score[rows, best] > own
+            j = a + rows[improve]
+            i = best[improve]
+            count[j] = count[i] + 1
+            visited[j] = cand_visited[rows[improve], i]
+            miles[j] = cand_miles[rows[improve], i]
+            prev[j] = i
+
+        parks_visited = _popcount(visited)
+        if objective == "ballparks":
+            final = key(parks_visited, count, miles)
+        else:
+            final = key(count, parks_visited, miles)
+
+        trips = []
+        for end in np.argsort(-final, kind="stable")[:top]:
+            path = [end]
+            while prev[path[-1]] >= 0:
+                path.append(prev[path[-1]])
+            path = np.asarray(path[::-1])
+
+            trip = self.games.iloc[lo + path][["Date", "Away Team", "Home Team", "State", "Home Team Lat", "Home Team Long"]].copy()
+            legs = np.r_[0.0, self.distance[park[path[:-1]], park[path[1:]]]]
+            trip["Miles From Previous"] = legs.round(0)
+            trips.append(trip.reset_index(drop=True))
+        return trips
+
+
+def summarize_trips(trips):
+    """One row per trip: games, distinct ballparks, total miles and the route."""
+    return pd.DataFrame([
+        {
+            "Trip": number,
+            "Games": len(trip),
+            "Ballparks": trip["Home Team"].nunique(),
+            "Total Miles": float(trip["Miles From Previous"].sum()),
+            "Route": " → ".join(trip["Home Team"].astype(str)),
+        }
+        for number, trip in enumerate(trips, start=1)
+    ])
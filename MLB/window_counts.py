@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+
+class WindowCounts:
+    """
+    Prefix-sum game counts over a ScheduleIndex, for date-window queries.
+
+    Home games are counted per day for every (home team, state) pair seen in
+    the schedule, and per day for every (pair, opponent), then accumulated
+    along the day axis. The counts for any window are the difference of two
+    day slices, so the pie, heatmap and window cumulative counts cost
+    O(teams) per rerun however many days the window spans. Filtering on
+    (home team, state) pairs keeps team and state selections exact.
+    """
+
+    def __init__(self, schedule):
+        games = schedule.games
+        days = schedule.dates.astype("datetime64[D]")
+        self.first_day = days[0] if len(days) else np.datetime64("1970-01-01", "D")
+        self.day = (days - self.first_day).astype(np.int64)
+        n_days = int(self.day[-1]) + 1 if len(days) else 0
+
+        away = games["Away Team"].astype("category")
+        self.teams = schedule.teams.union(away.cat.categories)
+        self.states = schedule.states
+        self.home_codes = self.teams.get_indexer(schedule.teams)[schedule.team_codes]
+        self.home_codes[schedule.team_codes < 0] = -1
+        away_codes = self.teams.get_indexer(away.cat.categories)[away.cat.codes.to_numpy()]
+        away_codes[away.cat.codes.to_numpy() < 0] = -1
+
+        # Distinct (home team, state) pairs, the rows of both cubes
+        valid = (self.home_codes >= 0) & (schedule.state_codes >= 0)
+        pair_keys = self.home_codes.astype(np.int64) * len(self.states) + schedule.state_codes
+        pairs, pair_codes = np.unique(pair_keys[valid], return_inverse=True)
+        self.pair_team = pairs // max(len(self.states), 1)
+        self.pair_state = pairs % max(len(self.states), 1)
+
+        day = self.day[valid]
+        home = np.zeros((n_days + 1, len(pairs)), dtype=np.int32)
+        np.add.at(home, (day + 1, pair_codes), 1)
+        self.home_cum = home.cumsum(axis=0, dtype=np.int32)
+
+        has_away = away_codes[valid] >= 0
+        matchups = np.zeros((n_days + 1, len(pairs), len(self.teams)), dtype=np.int32)
+        np.add.at(matchups, (day[has_away] + 1, pair_codes[has_away], away_codes[valid][has_away]), 1)
+        self.matchup_cum = matchups.cumsum(axis=0, dtype=np.int32)
+
+        # Per-team totals for the window cumulative counts without a state filter
+        team_daily = np.zeros((n_days + 1, len(self.teams)), dtype=np.int32)
+        np.add.at(team_daily, (self.day[self.home_codes >= 0] + 1, self.home_codes[self.home_codes >= 0]), 1)
+        self.team_home = team_daily.cumsum(axis=0, dtype=np.int32)
+
+        # First day of each row's season, so window counts restart with the season
+        season = games["Season"].to_numpy()
+        starts = pd.Series(self.day).groupby(season).transform("min")
+        self.season_start = starts.to_numpy(dtype=np.int64)
+        self.season_to_date = games["Cumulative Games"].to_numpy(dtype=np.int64)
+
+    def _days(self, start, end):
+        # Prefix rows bounding the days start..end, clipped to the schedule
+        n_days = len(self.home_cum) - 1
+        lo = (np.datetime64(pd.Timestamp(start).date(), "D") - self.first_day).astype(np.int64)
+        hi = (np.datetime64(pd.Timestamp(end).date(), "D") - self.first_day).astype(np.int64) + 1
+        return int(np.clip(lo, 0, n_days)), int(np.clip(hi, 0, n_days))
+
+    def _pairs(self, teams, states):
+        keep = np.ones(len(self.pair_team), dtype=bool)
+        if len(teams):
+            keep &= np.isin(self.pair_team, self.teams.get_indexer(list(teams)))
+        if len(states):
+            keep &= np.isin(self.pair_state, self.states.get_indexer(list(states)))
+        return keep
+
+    def home_games(self, start, end, teams=(), states=()):
+        """Home games per team between start and end (inclusive), teams with none left out."""
+        lo, hi = self._days(start, end)
+        window = (self.home_cum[hi] - self.home_cum[lo]) * self._pairs(teams, states)
+        counts = np.bincount(self.pair_team, weights=window, minlength=len(self.teams)).astype(np.int64)
+        present = counts > 0
+        return pd.DataFrame({"Home Team": self.teams[present], "Games": counts[present]})
+
+    def matchups(self, start, end, teams=(), states=()):
+        """
+        Symmetric Team x Opponent counts between start and end (inclusive):
+        each filtered game counts once for its home team against the away
+        team and once the other way round.
+        """
+        lo, hi = self._days(start, end)
+        keep = self._pairs(teams, states)
+        window = (self.matchup_cum[hi] - self.matchup_cum[lo])[keep]
+        counts = np.zeros((len(self.teams), len(self.teams)), dtype=np.int64)
+        np.add.at(counts, self.pair_team[keep], window)
+        counts = counts + counts.T
+
+        present = np.flatnonzero(counts.sum(axis=1) > 0)
+        teams = self.teams[present]
+        return pd.DataFrame(
+            counts[np.ix_(present, present)],
+            index=pd.Index(teams, name="Team"),
+            columns=pd.Index(teams, name="Opponent"),
+        )
+
+    def cumulative_in_window(self, positions, start, states=()):
+        """
+        Running count of each team's home games from ``start`` for the games
+        at ``positions`` (1 for the first game in the window), restarting
+        with each season like the season-to-date 'Cumulative Games'. With
+        ``states``, only the team's home games in those states are counted.
+        """
+        lo, _ = self._days(start, start)
+        season_start = self.season_start[positions]
+        codes = self.home_codes[positions]
+        since = np.maximum(lo, season_start)
+        if not len(states):
+            before = self.team_home[since, codes] - self.team_home[season_start, codes]
+            return self.season_to_date[positions] - before
+
+        day = self.day[positions]
+        # The game's place among its team's games that day, from the season-to-date count
+        same_day = self.season_to_date[positions] - (self.team_home[day, codes] - self.team_home[season_start, codes])
+        # Earlier days of the window, summed over the team's pairs in the selected states
+        team_pairs = (self.pair_team == codes[:, None]) & self._pairs((), states)
+        earlier = ((self.home_cum[day] - self.home_cum[since]) * team_pairs).sum(axis=1)
+        return earlier + same_day
@@ -1,18 +1,21 @@
 import streamlit as st
 import shutil
-from PIL import Image
-import pytesseract
 import datetime
 import json
 import requests
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import re
+import asyncio
+import io
 import os
-import subprocess
+from ocr_engine import OCREngine, OCRUnavailable
+from preprocess import OCR_WIDTH, PREPROCESS_VERSION, prepare_receipt
+from result_cache import ResultCache, content_hash
+from extraction import EMPTY_EXTRACTION, extract_many, extraction_request
+from batch import ocr_image as batch_ocr_image, receipt_files, review_rows
+from sheet_writer import FakeWorksheet, SheetWriter, open_worksheet
 
 # === NEW: OpenAI client ===
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 # === CONFIGURATION ===
 # Replace Together with OpenAI
@@ -42,47 +45,71 @@ currency_options = {
     "CNY - Chinese Yuan": "CNY"
 }
 
+category_choices = ["🍽️ Meals", "🥫 Groceries", "✈️ Vacation Travel", "🛌 Vacation Accomodation", "🖇️ Office Supplies", "🧾 Miscellaneous"]
+
+# OCR text and OpenAI results are cached on disk by content hash, so a duplicate
+# receipt costs no OCR time and no API call (see result_cache.py)
+ocr_results = ResultCache("ocr")
+extraction_results = ResultCache("extraction")
+
 # === OpenAI receipt interpreter (replaces Together/OpenRouter) ===
 def interpret_details_with_openai(parsed_text: str) -> dict:
     """
     Sends the OCR'd receipt text to OpenAI to extract structured data.
-    Forces JSON output so we can parse reliably.
+    Forces JSON output so we can parse reliably. Results are cached per
+    receipt text, model and prompt (see extraction.py).
     """
-    system = (
-        "You extract structured data from receipts. "
-        "Return a strict JSON object with keys: "
-        "store_name (string), address (string), "
-        "items (object mapping arbitrary keys to {name: string, price: string}), "
-        "total (string or number), currency (string like 'USD','EUR','CAD'). "
-        "Do NOT invent items or totals; if unknown, use an empty string or empty object. "
-        "Do NOT wrap the JSON in markdown fences."
-    )
-
-    user = (
-        "Read the receipt text below and extract fields. "
-        "If multiple numeric totals appear, set 'total' to the largest plausible final charge. "
-        "Keep prices as strings or plain numbers without currency symbols.\n\n"
-        f"Receipt text:\n{parsed_text}"
-    )
+    key, request = extraction_request(parsed_text)
+    cached = extraction_results.get(key)
+    if cached is not None:
+        return cached
 
     try:
-        # Use a small, fast model; change to 'gpt-4o' if you prefer
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            temperature=0.2,
-            # Force valid JSON
-            response_format={"type": "json_object"}
-        )
+        resp = client.chat.completions.create(**request)
         content = resp.choices[0].message.content
-        return json.loads(content)
+        extracted = json.loads(content)
     except Exception as e:
-        # Bubble up a safe default so the UI doesn't crash
+        # Bubble up a safe default so the UI doesn't crash; failures are not cached
         st.error(f"❌ OpenAI API error: {e}")
-        return {"store_name": "", "address": "", "items": {}, "total": "", "currency": ""}
+        return dict(EMPTY_EXTRACTION)
+    extraction_results.put(key, extracted)
+    return extracted
+
+def ocr_key(image_hash):
+    # OCR text per image content and OCR settings
+    return content_hash(image_hash, ocr.backend, ocr.lang, str(OCR_WIDTH), str(PREPROCESS_VERSION))
+
+def recognize_receipt(image_hash, ocr_image):
+    key = ocr_key(image_hash)
+    text = ocr_results.get(key)
+    if text is None:
+        text = ocr.recognize(ocr_image)
+        ocr_results.put(key, text)
+    return text
+
+async def extract_batch(texts):
+    # Retries with backoff are done in extract_many, not by the client
+    async with AsyncOpenAI(api_key=openai_api_key, max_retries=0) as async_client:
+        return await extract_many(async_client, texts, extraction_results)
+
+def process_batch(files):
+    """
+    Extraction results for a batch of (name, image bytes): OCR text from the
+    cache or, for the rest, from the OCR worker pool, then every text sent
+    to OpenAI concurrently. Failed receipts get their exception as result.
+    """
+    hashes = [content_hash(data) for _, data in files]
+    texts = [ocr_results.get(ocr_key(image_hash)) for image_hash in hashes]
+    missing = [i for i, text in enumerate(texts) if text is None]
+    if missing:
+        with st.spinner(f"🔎 Extracting text from {len(missing)} receipts with OCR..."):
+            recognized = ocr.recognize_many([files[i][1] for i in missing], prepare=batch_ocr_image)
+        for i, text in zip(missing, recognized):
+            texts[i] = text
+            ocr_results.put(ocr_key(hashes[i]), text)
+
+    with st.spinner(f"🧠 Structuring {len(files)} receipts with OpenAI..."):
+        return asyncio.run(extract_batch(texts))
 
 def download_creds_file(url, output_path):
     try:
@@ -99,22 +126,26 @@ def download_creds_file(url, output_path):
         st.error(f"❌ Error downloading credentials: {e}")
         return None
 
-def next_available_row(worksheet, start_row=18):
-    column = worksheet.col_values(1)
-    sub_col = column[start_row - 1:]
-    row_offset = len(list(filter(None, sub_col)))
-    return start_row + row_offset
-
-def insert_expense_data(cred_path, sheet_url, sheet_gid, data, order):
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    credentials = ServiceAccountCredentials.from_json_keyfile_name(cred_path, scope)
-    client_gs = gspread.authorize(credentials)
-    spreadsheet = client_gs.open_by_url(sheet_url)
-    worksheet = spreadsheet.get_worksheet_by_id(sheet_gid)
-    row = next_available_row(worksheet)
-    row_data = [data.get(col, "") for col in order]
-    worksheet.insert_row(row_data, row)
-    return row
+# Authorized worksheet handle shared by every submit and session, re-authorized hourly.
+# RECEIPT_FAKE_SHEETS=1 writes to an in-memory sheet instead (see sheet_writer.py)
+@st.cache_resource(ttl=3600)
+def sheet_writer():
+    if os.environ.get("RECEIPT_FAKE_SHEETS") == "1":
+        return SheetWriter(FakeWorksheet(), column_order)
+    if not download_creds_file(cred_url, cred_path):
+        raise RuntimeError("could not download the Google credentials")
+    return SheetWriter(open_worksheet(cred_path, sheet_url, sheet_gid), column_order)
+
+# Tesseract is located and the OCR backend warmed up once per process, not per rerun;
+# clearing the cache shuts the engine's worker pool down
+@st.cache_resource(on_release=OCREngine.close)
+def ocr_engine():
+    return OCREngine()
+
+# Downscaled, cropped and binarized image for OCR plus a small preview, once per upload
+@st.cache_data(max_entries=4)
+def prepared_receipt(image_bytes):
+    return prepare_receipt(io.BytesIO(image_bytes))
 
 def validate_submission_data(submission_data, match_amount: int):
     # Check if all required fields are filled
@@ -137,19 +168,79 @@ def validate_submission_data(submission_data, match_amount: int):
 st.set_page_config(page_title="Receipt Parser", page_icon="📸", layout="centered")
 st.title("📸 Receipt Parser and Logger (OpenAI)")
 
-# Try installing tesseract at runtime (best-effort)
+# Tesseract comes from packages.txt at deploy time; OCR is disabled if it is missing
 try:
-    subprocess.run(['apt-get', 'update', '-y'], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    subprocess.run(['apt-get', 'install', '-y', 'tesseract-ocr'], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    # st.write("Tesseract installed successfully!")
-except subprocess.CalledProcessError as e:
-    st.write(f"Note: Tesseract install may have failed in this environment: {e}")
+    ocr = ocr_engine()
+except OCRUnavailable as e:
+    ocr = None
+    st.warning(f"OCR is unavailable, enter the receipt manually: {e}")
 
 mode = "AI-assisted"
 parsed_text = ""
 data = {"items": {}, "total": 0.0}
 
-input_method = st.radio("Provide the receipt via", ["Upload a file", "Use camera", "Manual Entry"])
+input_method = st.radio("Provide the receipt via", ["Upload a file", "Use camera", "Manual Entry", "Batch upload"])
+
+# === Batch mode: many receipts at once, reviewed in one grid ===
+if input_method == "Batch upload":
+    today = datetime.date.today()
+    with st.expander("📂 Batch Upload", expanded=True):
+        uploads = st.file_uploader("Upload receipt images or a zip of them", type=["png", "jpg", "jpeg", "zip"], accept_multiple_files=True)
+        files = receipt_files(uploads or [])
+        st.caption(f"{len(files)} receipt image(s)")
+
+        if files and ocr is None:
+            st.error("❌ OCR is unavailable in this environment.")
+        elif files and st.button("🔎 Process Receipts"):
+            results = process_batch(files)
+            st.session_state["batch_rows"] = review_rows(
+                [name for name, _ in files], results,
+                expense_date=today, effective_month=today.strftime("%B %Y"),
+                who="", category="", default_currency="CAD",
+            )
+
+    if "batch_rows" in st.session_state:
+        with st.expander("🧾 Review Receipts", expanded=True):
+            edited = st.data_editor(
+                st.session_state["batch_rows"],
+                column_config={
+                    "Expense date": st.column_config.DateColumn("Expense date", format="YYYY-MM-DD"),
+                    "amount": st.column_config.NumberColumn("amount", format="%.2f"),
+                    "category": st.column_config.SelectboxColumn("category", options=category_choices),
+                    "Currency": st.column_config.SelectboxColumn("Currency", options=list(currency_options.values())),
+                },
+                disabled=["File", "Status"],
+                hide_index=True,
+                num_rows="dynamic",
+                key="batch_editor",
+            )
+
+            if st.button("✅ Submit All"):
+                incomplete = edited[(edited["who"].fillna("") == "") | (edited["category"].fillna("") == "") | (edited["amount"].fillna(0) == 0)]
+                if not incomplete.empty:
+                    st.error("❌ Please fill in who, category and amount for: " + ", ".join(incomplete["File"].astype(str)))
+                else:
+                    expenses = [
+                        {
+                            "Expense date": str(row["Expense date"]),
+                            "Effective month": row["Effective month"],
+                            "who": row["who"],
+                            "amount": str(row["amount"]),
+                            "what": row["Store"],
+                            "category": row["category"],
+                            "Currency": row["Currency"],
+                        }
+                        for row in edited.to_dict("records")
+                    ]
+                    # All rows in one append call
+                    with st.spinner(f"📤 Uploading {len(expenses)} receipts to Google Sheets..."):
+                        try:
+                            rows = sheet_writer().append(expenses)
+                            st.success(f"✅ Uploaded {len(rows)} receipts to Google Sheets at rows {rows[0]}–{rows[-1]}.")
+                            del st.session_state["batch_rows"]
+                        except Exception as e:
+                            st.error(f"❌ Error uploading to Google Sheets: {e}")
+    st.stop()
 uploaded_file = captured_image = None
 
 if input_method != "Manual Entry":
@@ -161,15 +252,22 @@ if input_method != "Manual Entry":
 
         if uploaded_file or captured_image:
             image_file = uploaded_file if uploaded_file else captured_image
-            image = Image.open(image_file)
-            st.image(image, caption="Receipt", use_container_width=True)
-
-            # Only OCR + extract once per session to avoid re-billing
-            fresh_parse = "parsed_text" not in st.session_state
-            if fresh_parse:
+            image_bytes = image_file.getvalue()
+            ocr_image, preview = prepared_receipt(image_bytes)
+            st.image(preview, caption="Receipt", use_container_width=True)
+
+            # OCR + extract once per image; a different image always gets a fresh parse
+            image_hash = content_hash(image_bytes)
+            fresh_parse = st.session_state.get("receipt_hash") != image_hash
+            if fresh_parse and ocr is None:
+                st.error("❌ OCR is unavailable in this environment.")
+            elif fresh_parse:
                 with st.spinner("🔎 Extracting text with OCR..."):
-                    parsed_text = pytesseract.image_to_string(image)
+                    parsed_text = recognize_receipt(image_hash, ocr_image)
                     st.session_state["parsed_text"] = parsed_text
+                    st.session_state["receipt_hash"] = image_hash
+                    # Itemisation is filled from the new receipt's items
+                    st.session_state["items"] = []
 
                 with st.spinner("🧠 Structuring with OpenAI..."):
                     extracted = interpret_details_with_openai(parsed_text)
@@ -195,7 +293,7 @@ with st.expander("🧾 Receipt Details", expanded=True):
 
     category_options = st.pills(
         "Category",
-        options=["🍽️ Meals", "🥫 Groceries", "✈️ Vacation Travel", "🛌 Vacation Accomodation", "🖇️ Office Supplies", "🧾 Miscellaneous", "➕ Other"],
+        options=category_choices + ["➕ Other"],
         help="Select or enter a category",
         selection_mode="single"
     )
@@ -343,12 +441,11 @@ if st.button("✅ Submit"):
 
     if validate_submission_data(submission_data, match_amount):
         with st.spinner("📤 Uploading to Google Sheets..."):
-            if download_creds_file(cred_url, cred_path):
-                try:
-                    row_num = insert_expense_data(cred_path, sheet_url, sheet_gid, expense_data, column_order)
-                    st.success(f"✅ Uploaded to Google Sheets at row {row_num}.")
-                except Exception as e:
-                    st.error(f"❌ Error uploading to Google Sheets: {e}")
+            try:
+                row_num = sheet_writer().append([expense_data])[0]
+                st.success(f"✅ Uploaded to Google Sheets at row {row_num}.")
+            except Exception as e:
+                st.error(f"❌ Error uploading to Google Sheets: {e}")
         st.json(submission_data)
     else:
         st.warning("Please fill in all required fields and ensure itemisation matches")
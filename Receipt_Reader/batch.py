@@ -0,0 +1,65 @@
+import io
+import os
+import zipfile
+
+import pandas as pd
+
+from preprocess import prepare_receipt
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+# Columns of the review grid, in sheet order after the file name
+REVIEW_COLUMNS = ["File", "Store", "Expense date", "Effective month", "who", "amount", "category", "Currency", "Status"]
+
+
+def receipt_files(uploads):
+    """
+    (name, bytes) of every receipt image among the uploaded files, with zip
+    archives expanded. Folders, hidden files and non-images are skipped.
+    """
+    files = []
+    for upload in uploads:
+        data = upload.getvalue()
+        if not upload.name.lower().endswith(".zip"):
+            files.append((upload.name, data))
+            continue
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for info in archive.infolist():
+                base = os.path.basename(info.filename)
+                if info.is_dir() or base.startswith(".") or "__MACOSX" in info.filename:
+                    continue
+                if base.lower().endswith(IMAGE_EXTENSIONS):
+                    files.append((f"{upload.name}/{info.filename}", archive.read(info)))
+    return files
+
+
+def ocr_image(image_bytes):
+    # Runs in the OCR worker processes, so it has to be a module-level function
+    return prepare_receipt(io.BytesIO(image_bytes))[0]
+
+
+def review_rows(names, results, expense_date, effective_month, who, category, default_currency):
+    """
+    Review grid for a batch: one row per receipt with the extracted store,
+    total and currency, the shared fields filled in, and a status naming
+    any receipt whose extraction failed.
+    """
+    rows = []
+    for name, result in zip(names, results):
+        failed = isinstance(result, BaseException)
+        extracted = {} if failed else result
+        try:
+            amount = float(str(extracted.get("total", "") or 0).replace(",", ""))
+        except ValueError:
+            amount = 0.0
+        rows.append({
+            "File": name,
+            "Store": extracted.get("store_name", ""),
+            "Expense date": expense_date,
+            "Effective month": effective_month,
+            "who": who,
+            "amount": amount,
+            "category": category,
+            "Currency": extracted.get("currency", "") or default_currency,
+            "Status": f"⚠️ {type(result).__name__}: {result}" if failed else "✅ Extracted",
+        })
+    return pd.DataFrame(rows, columns=REVIEW_COLUMNS)
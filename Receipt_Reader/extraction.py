@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+import random
+
+import openai
+
+from result_cache import content_hash
+
+# Use a small, fast model; change to 'gpt-4o' if you prefer
+EXTRACTION_MODEL = "gpt-4o-mini"
+EMPTY_EXTRACTION = {"store_name": "", "address": "", "items": {}, "total": "", "currency": ""}
+# Model calls in flight at once in batch mode, and retries per receipt
+EXTRACT_CONCURRENCY = int(os.environ.get("RECEIPT_EXTRACT_CONCURRENCY", 8))
+EXTRACT_RETRIES = int(os.environ.get("RECEIPT_EXTRACT_RETRIES", 4))
+
+SYSTEM_PROMPT = (
+    "You extract structured data from receipts. "
+    "Return a strict JSON object with keys: "
+    "store_name (string), address (string), "
+    "items (object mapping arbitrary keys to {name: string, price: string}), "
+    "total (string or number), currency (string like 'USD','EUR','CAD'). "
+    "Do NOT invent items or totals; if unknown, use an empty string or empty object. "
+    "Do NOT wrap the JSON in markdown fences."
+)
+
+# Rate limits, timeouts, dropped connections and 5xx are worth another try
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+def user_prompt(parsed_text):
+    return (
+        "Read the receipt text below and extract fields. "
+        "If multiple numeric totals appear, set 'total' to the largest plausible final charge. "
+        "Keep prices as strings or plain numbers without currency symbols.\n\n"
+        f"Receipt text:\n{parsed_text}"
+    )
+
+
+def extraction_request(parsed_text):
+    """(cache key, chat completion arguments) for one receipt's OCR text."""
+    user = user_prompt(parsed_text)
+    key = content_hash(EXTRACTION_MODEL, SYSTEM_PROMPT, user)
+    request = dict(
+        model=EXTRACTION_MODEL,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user},
+        ],
+        temperature=0.2,
+        # Force valid JSON
+        response_format={"type": "json_object"},
+    )
+    return key, request
+
+
+async def _extract_one(client, parsed_text, cache, semaphore, retries, base_delay):
+    key, request = extraction_request(parsed_text)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    for attempt in range(retries + 1):
+        try:
+            async with semaphore:
+                resp = await client.chat.completions.create(**request)
+            break
+        except RETRYABLE_ERRORS:
+            if attempt == retries:
+                raise
+            # Exponential backoff with jitter, outside the semaphore so others can proceed
+            await asyncio.sleep(base_delay * 2 ** attempt * (1 + random.random()))
+
+    extracted = json.loads(resp.choices[0].message.content)
+    cache.put(key, extracted)
+    return extracted
+
+
+async def extract_many(client, texts, cache, concurrency=EXTRACT_CONCURRENCY, retries=EXTRACT_RETRIES, base_delay=1.0):
+    """
+    Structured data for each OCR text, in order, with at most ``concurrency``
+    requests in flight on the ``openai.AsyncOpenAI`` client. Cached results
+    are returned without a request; a receipt whose request still fails
+    after ``retries`` retries gets its exception in place of a result.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *(_extract_one(client, text, cache, semaphore, retries, base_delay) for text in texts),
+        return_exceptions=True,
+    )
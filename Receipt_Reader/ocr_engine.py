@@ -0,0 +1,162 @@
+import atexit
+import itertools
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytesseract
+
+# Tesseract language(s), e.g. "eng+fra"
+OCR_LANG = os.environ.get("RECEIPT_OCR_LANG", "eng")
+# Worker processes for batches of receipts
+OCR_WORKERS = int(os.environ.get("RECEIPT_OCR_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+class OCRUnavailable(RuntimeError):
+    """Raised when neither tesserocr nor a tesseract binary can be found."""
+
+
+def find_tesseract():
+    """Path of the tesseract binary ($TESSERACT_CMD first, then PATH), or None."""
+    cmd = os.environ.get("TESSERACT_CMD") or shutil.which("tesseract")
+    return cmd if cmd and os.path.exists(cmd) else None
+
+
+def find_tessdata(cmd):
+    """
+    Directory of the traineddata files ($TESSDATA_PREFIX first, then the one
+    the tesseract binary at ``cmd`` reports), or None.
+
+    The tesserocr wheels bundle their own libtesseract, which does not know
+    where the system's tesseract-ocr package keeps its language data.
+    """
+    prefix = os.environ.get("TESSDATA_PREFIX")
+    if prefix:
+        return prefix
+    if not cmd:
+        return None
+    try:
+        listing = subprocess.run([cmd, "--list-langs"], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # 'List of available languages in "/usr/share/tesseract-ocr/5/tessdata/" (3):'
+    match = re.search(r'"([^"]+)"', listing.stdout + listing.stderr)
+    return match.group(1) if match else None
+
+
+def _open_api(lang, tessdata):
+    # Persistent in-process Tesseract API (model loaded once), if tesserocr is installed
+    try:
+        import tesserocr
+    except ImportError:
+        return None
+    try:
+        return tesserocr.PyTessBaseAPI(path=tessdata, lang=lang) if tessdata else tesserocr.PyTessBaseAPI(lang=lang)
+    except RuntimeError:
+        # Language data not found; pytesseract may still work through the binary
+        return None
+
+
+class _Backend:
+    """Runs OCR with a warm tesserocr API, or through pytesseract when that is unavailable."""
+
+    def __init__(self, cmd, lang, tessdata=None):
+        self.lang = lang
+        self.api = _open_api(lang, tessdata)
+        if cmd:
+            pytesseract.pytesseract.tesseract_cmd = cmd
+        self.lock = threading.Lock()
+
+    def __call__(self, image):
+        if self.api is None:
+            return pytesseract.image_to_string(image, lang=self.lang)
+        # One API instance is not thread safe
+        with self.lock:
+            self.api.SetImage(image)
+            return self.api.GetUTF8Text()
+
+    def close(self):
+        with self.lock:
+            if self.api is not None:
+                self.api.End()
+                self.api = None
+
+
+_worker_backend = None
+
+
+def _init_worker(cmd, lang, tessdata):
+    global _worker_backend
+    _worker_backend = _Backend(cmd, lang, tessdata)
+
+
+def _recognize_in_worker(image, prepare):
+    return _worker_backend(prepare(image) if prepare else image)
+
+
+class OCREngine:
+    """
+    OCR for receipt images, set up once per process.
+
+    The tesseract binary is located when the engine is created rather than
+    installed on every rerun. With tesserocr installed, ``recognize`` goes
+    through one persistent Tesseract API so the model is loaded once;
+    otherwise it falls back to pytesseract, which starts tesseract per call.
+    ``recognize_many`` spreads a batch over a pool of worker processes, each
+    holding its own warm backend; the pool is started on first use.
+    ``close`` stops the pool and frees the API; it also runs at exit.
+    """
+
+    def __init__(self, lang=OCR_LANG, workers=OCR_WORKERS):
+        self.cmd = find_tesseract()
+        self.tessdata = find_tessdata(self.cmd)
+        self.lang = lang
+        self.workers = max(1, workers)
+        self._backend = _Backend(self.cmd, lang, self.tessdata)
+        if self._backend.api is None and self.cmd is None:
+            raise OCRUnavailable(
+                "Tesseract was not found. Install tesseract-ocr (see packages.txt) or set TESSERACT_CMD."
+            )
+        self._pool = None
+        atexit.register(self.close)
+
+    @property
+    def backend(self):
+        return "tesserocr" if self._backend.api is not None else "pytesseract"
+
+    def recognize(self, image):
+        """Text of one PIL image."""
+        return self._backend(image)
+
+    def recognize_many(self, images, prepare=None):
+        """
+        Text of each image, in order, recognized in parallel worker processes.
+
+        ``prepare``, if given, is a module-level function run in the worker
+        to turn each item (e.g. raw file bytes) into the PIL image to read,
+        so preprocessing is spread over the workers too.
+        """
+        images = list(images)
+        if len(images) <= 1 or self.workers == 1:
+            return [self.recognize(prepare(image) if prepare else image) for image in images]
+        if self._pool is None:
+            # spawn: forking a process that runs Streamlit's threads is not safe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.cmd, self.lang, self.tessdata),
+            )
+        return list(self._pool.map(_recognize_in_worker, images, itertools.repeat(prepare)))
+
+    def close(self):
+        """Stop the worker pool and free the in-process API; safe to call more than once."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._backend.close()
+        atexit.unregister(self.close)
@@ -0,0 +1,188 @@
+import os
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# Bump when the steps below change, so cached OCR text is not reused
+PREPROCESS_VERSION = 2
+# Receipt width to scale to before OCR: 80 mm till paper at ~300 DPI
+OCR_WIDTH = int(os.environ.get("RECEIPT_OCR_WIDTH", 1000))
+# Longest side to decode photos at; JPEGs are decoded at reduced scale straight away
+DECODE_SIDE = 2400
+PREVIEW_SIDE = 800
+# Deskew search range and step, in degrees
+MAX_SKEW = 5.0
+SKEW_STEP = 0.5
+
+
+def open_oriented(file, max_side=DECODE_SIDE):
+    """Decode an image at most ``max_side`` pixels on its longest side, rotated upright per EXIF."""
+    image = Image.open(file)
+    # For JPEGs this picks a DCT scale, so a 12 MP photo is never decoded in full
+    image.draft("RGB", (max_side, max_side))
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_side, max_side), Image.LANCZOS)
+    return image.convert("RGB")
+
+
+def otsu_threshold(gray):
+    """Otsu's global threshold for a uint8 array."""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    weight = hist.cumsum()
+    mean = (hist * np.arange(256)).cumsum()
+    total_weight, total_mean = weight[-1], mean[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (total_mean * weight - mean * total_weight) ** 2 / (weight * (total_weight - weight))
+    # A single-valued image has no split; all NaN becomes threshold 0
+    return int(np.argmax(np.nan_to_num(between)))
+
+
+def _largest_component(mask, max_steps=2048):
+    """
+    Boolean mask of the largest 4-connected region of True pixels.
+
+    Labels start as each pixel's own index and every step takes the largest
+    label among a pixel and its neighbours inside the mask, so each region
+    converges to one label; on a small image that takes a few hundred
+    vectorized steps.
+    """
+    labels = np.where(mask, np.arange(mask.size).reshape(mask.shape) + 1, 0)
+    for _ in range(max_steps):
+        grown = labels.copy()
+        np.maximum(grown[1:], labels[:-1], out=grown[1:])
+        np.maximum(grown[:-1], labels[1:], out=grown[:-1])
+        np.maximum(grown[:, 1:], labels[:, :-1], out=grown[:, 1:])
+        np.maximum(grown[:, :-1], labels[:, 1:], out=grown[:, :-1])
+        grown[~mask] = 0
+        if np.array_equal(grown, labels):
+            break
+        labels = grown
+    counts = np.bincount(labels.ravel())
+    counts[0] = 0
+    return labels == counts.argmax() if counts.any() else mask
+
+
+def _spans(mask):
+    # Fill each row and each column of the mask between its first and last True pixel
+    def fill(m):
+        seen = np.maximum.accumulate(m, axis=1)
+        return seen & np.maximum.accumulate(m[:, ::-1], axis=1)[:, ::-1]
+    return fill(mask) & fill(mask.T).T
+
+
+def receipt_mask(image, sample_side=256):
+    """
+    Boolean mask, on a copy at most ``sample_side`` pixels on a side, of the
+    receipt in an RGB image, or None when no receipt stands out.
+
+    Paper is bright and nearly colourless, while tables, wood and hands that
+    are light are still tinted, so each pixel is scored by brightness minus
+    saturation and split with Otsu's threshold. The receipt is the largest
+    connected region of paper, with the text printed on it filled in. None
+    when that region spans (nearly) the whole image or is implausibly small.
+    """
+    small = image.convert("RGB")
+    small.thumbnail((sample_side, sample_side))
+    hsv = np.asarray(small.convert("HSV"), dtype=np.int16)
+    whiteness = np.clip(hsv[..., 2] - hsv[..., 1], 0, 255).astype(np.uint8)
+    paper = _spans(_largest_component(whiteness > otsu_threshold(whiteness)))
+
+    rows, cols = np.flatnonzero(paper.any(axis=1)), np.flatnonzero(paper.any(axis=0))
+    if not len(rows):
+        return None
+    box_area = (cols[-1] + 1 - cols[0]) * (rows[-1] + 1 - rows[0]) / paper.size
+    if box_area > 0.95 or paper.mean() < 0.1:
+        return None
+    return paper
+
+
+def _mask_bbox(paper, size, margin):
+    # Bounding box of the True pixels of a sampled mask, in the coordinates of an image of ``size``
+    rows, cols = np.flatnonzero(paper.any(axis=1)), np.flatnonzero(paper.any(axis=0))
+    width, height = size
+    sx, sy = width / paper.shape[1], height / paper.shape[0]
+    pad_x, pad_y = margin * width, margin * height
+    return (
+        max(0, int(cols[0] * sx - pad_x)),
+        max(0, int(rows[0] * sy - pad_y)),
+        min(width, int((cols[-1] + 1) * sx + pad_x)),
+        min(height, int((rows[-1] + 1) * sy + pad_y)),
+    )
+
+
+def receipt_bbox(image, sample_side=256, margin=0.01):
+    """(left, top, right, bottom) of the receipt in an RGB image (see ``receipt_mask``), or None."""
+    paper = receipt_mask(image, sample_side)
+    return None if paper is None else _mask_bbox(paper, image.size, margin)
+
+
+def skew_angle(gray, sample_width=600):
+    """
+    Rotation in degrees (counter-clockwise, as Image.rotate) that levels the
+    text lines: the angle whose row profile of ink is sharpest.
+    """
+    small = gray.copy()
+    small.thumbnail((sample_width, sample_width * 4))
+    pixels = np.asarray(small)
+    ink = Image.fromarray(np.where(pixels < otsu_threshold(pixels), 255, 0).astype(np.uint8))
+
+    best, best_score = 0.0, -1.0
+    for angle in np.arange(-MAX_SKEW, MAX_SKEW + SKEW_STEP / 2, SKEW_STEP):
+        profile = np.asarray(ink.rotate(angle, resample=Image.NEAREST), dtype=np.float64).sum(axis=1)
+        score = np.square(np.diff(profile)).sum()
+        if score > best_score:
+            best, best_score = float(angle), score
+    return best
+
+
+def binarize(gray, block=51, offset=15):
+    """
+    Black text on white, thresholding each pixel against the mean of the
+    ``block`` x ``block`` square around it (from an integral image), so
+    shadows and uneven lighting across the photo do not swallow text.
+    """
+    pixels = np.asarray(gray)
+    r = block // 2
+    padded = np.pad(pixels, r, mode="edge").astype(np.int64)
+    integral = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), dtype=np.int64)
+    integral[1:, 1:] = padded.cumsum(axis=0).cumsum(axis=1)
+
+    b = 2 * r + 1
+    total = integral[b:, b:] - integral[:-b, b:] - integral[b:, :-b] + integral[:-b, :-b]
+    mean = total / (b * b)
+
+    return Image.fromarray(np.where(pixels > mean - offset, 255, 0).astype(np.uint8))
+
+
+def prepare_receipt(file):
+    """
+    (image for OCR, preview for display) from an uploaded receipt photo.
+
+    The photo is decoded at reduced scale and turned upright, cropped to the
+    receipt with the background around it painted white, converted to
+    grayscale, scaled so the receipt is ``OCR_WIDTH`` wide, deskewed and
+    binarized. The preview is a small color copy of the whole
+    photo, so the browser is not sent the full-resolution image.
+    """
+    image = open_oriented(file)
+    preview = image.copy()
+    preview.thumbnail((PREVIEW_SIDE, PREVIEW_SIDE))
+
+    gray = image.convert("L")
+    paper = receipt_mask(image)
+    if paper is not None:
+        box = _mask_bbox(paper, image.size, margin=0.01)
+        gray = gray.crop(box)
+        # Paint the table or wood grain beside a skewed receipt white, or it binarizes into noise
+        sx, sy = paper.shape[1] / image.width, paper.shape[0] / image.height
+        inside = Image.fromarray(paper.astype(np.uint8) * 255).resize(
+            gray.size, Image.BILINEAR, box=(box[0] * sx, box[1] * sy, box[2] * sx, box[3] * sy),
+        )
+        gray.paste(255, mask=inside.point(lambda v: 0 if v else 255))
+    if gray.width != OCR_WIDTH:
+        gray = gray.resize((OCR_WIDTH, max(1, round(gray.height * OCR_WIDTH / gray.width))), Image.LANCZOS)
+
+    angle = skew_angle(gray)
+    if angle:
+        gray = gray.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+    return binarize(gray), preview
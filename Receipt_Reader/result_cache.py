@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import tempfile
+
+CACHE_DIR = os.environ.get(
+    "RECEIPT_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+)
+CACHE_MAX_BYTES = int(float(os.environ.get("RECEIPT_CACHE_MAX_MB", 64)) * 2**20)
+
+
+def content_hash(*parts):
+    """sha256 hex digest of the given bytes/str parts, each length-prefixed so they cannot run together."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    JSON results on local disk, one file per key, evicted least recently
+    used first once the directory grows past ``max_bytes``.
+
+    Reads bump the file's modification time, which is the recency order.
+    Writes go through a temporary file and ``os.replace`` so concurrent
+    sessions never see a half-written entry.
+    """
+
+    def __init__(self, namespace, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = os.path.join(directory, namespace)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                value = json.load(f)
+            os.utime(path)
+            return value
+        except (OSError, ValueError):
+            return default
+
+    def put(self, key, value):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Delete the least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
@@ -0,0 +1,86 @@
+import re
+import threading
+
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+
+SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+# Expenses start below the sheet's header block
+START_ROW = 18
+
+_UPDATED_RANGE = re.compile(r"[A-Z]+(\d+)(?::[A-Z]+(\d+))?$")
+
+
+def open_worksheet(cred_path, sheet_url, sheet_gid):
+    """Authorize with the service account key at ``cred_path`` and open the worksheet by gid."""
+    credentials = ServiceAccountCredentials.from_json_keyfile_name(cred_path, SCOPE)
+    return gspread.authorize(credentials).open_by_url(sheet_url).get_worksheet_by_id(sheet_gid)
+
+
+def updated_rows(response):
+    """(first, last) row numbers written, from an append response's updatedRange."""
+    match = _UPDATED_RANGE.search(response["updates"]["updatedRange"])
+    first = int(match.group(1))
+    return first, int(match.group(2) or first)
+
+
+class SheetWriter:
+    """
+    Appends expense rows to one worksheet, keeping the handle open.
+
+    ``append`` writes all its rows in a single ``append_rows`` call anchored
+    at ``start_row``: Sheets finds the end of the table and inserts the rows
+    there, so a submit or a whole batch costs one API call, column A is
+    never read, and concurrent writers cannot overwrite each other's rows.
+    A failed call writes nothing and raises, so the caller can resubmit.
+    """
+
+    def __init__(self, worksheet, order, start_row=START_ROW):
+        self.worksheet = worksheet
+        self.order = order
+        self.start_row = start_row
+        # One append at a time on the shared handle
+        self._lock = threading.Lock()
+
+    def append(self, records):
+        """Write ``records``, dicts keyed by the column names in ``order``; returns their row numbers."""
+        rows = [[data.get(col, "") for col in self.order] for data in records]
+        if not rows:
+            return []
+        with self._lock:
+            response = self.worksheet.append_rows(
+                rows,
+                insert_data_option="INSERT_ROWS",
+                table_range=f"A{self.start_row}",
+            )
+        first, last = updated_rows(response)
+        return list(range(first, last + 1))
+
+
+class FakeWorksheet:
+    """
+    In-memory worksheet with the gspread calls SheetWriter uses, for trying
+    the app or the writer without Google credentials. ``calls`` counts API
+    calls by method name.
+    """
+
+    def __init__(self, title="Expenses", header_rows=START_ROW - 1):
+        self.title = title
+        self.rows = [[f"header {i}"] for i in range(1, header_rows + 1)]
+        self.calls = {}
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def append_rows(self, values, value_input_option="RAW", insert_data_option=None, table_range=None):
+        self._count("append_rows")
+        start = int(_UPDATED_RANGE.search(table_range).group(1)) if table_range else 1
+        end = start - 1
+        # Like Sheets, the table runs from its anchor to the last non-empty row below it
+        while end < len(self.rows) and any(self.rows[end]):
+            end += 1
+        first = end + 1
+        self.rows[end:end] = [list(row) for row in values]
+        last = first + len(values) - 1
+        width = max(len(row) for row in values)
+        return {"updates": {"updatedRange": f"'{self.title}'!A{first}:{chr(ord('A') + width - 1)}{last}"}}
@@ -0,0 +1,115 @@
+"""
+Local stand-in for the OpenAI chat completions endpoint, for trying batch
+mode without an API key or bill:
+
+    python stub_openai.py --port 8001 --delay 0.5 --fail-rate 0.2
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 streamlit run Receipt_Reader.py
+
+Every completion is a receipt extraction built from the "ITEM 1.23" and
+"TOTAL 4.56" lines of the prompt. ``--delay`` adds latency per request and
+``--fail-rate`` answers that share of requests with 429 to exercise retries.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PRICE_LINE = re.compile(r"^(.*?)\s+\$?(\d+[.,]\d{2})\s*$")
+
+
+def fake_extraction(prompt):
+    """Receipt JSON from the priced lines of the receipt text in ``prompt``."""
+    text = prompt.split("Receipt text:", 1)[-1].strip()
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    items, total = {}, ""
+    for line in lines:
+        match = PRICE_LINE.match(line)
+        if not match:
+            continue
+        name, price = match.group(1), match.group(2).replace(",", ".")
+        if "total" in name.lower():
+            total = price
+        else:
+            items[str(len(items) + 1)] = {"name": name.title(), "price": price}
+    return {
+        "store_name": lines[0].title() if lines else "",
+        "address": lines[1].title() if len(lines) > 1 else "",
+        "items": items,
+        "total": total,
+        "currency": "USD",
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    delay = 0.0
+    fail_rate = 0.0
+    requests_served = 0
+    lock = threading.Lock()
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            return self._send(404, {"error": {"message": f"No route {self.path}"}})
+        time.sleep(self.delay)
+        if random.random() < self.fail_rate:
+            return self._send(429, {"error": {"message": "Rate limited by stub", "type": "rate_limit"}})
+
+        with Handler.lock:
+            Handler.requests_served += 1
+            number = Handler.requests_served
+        prompt = body["messages"][-1]["content"]
+        self._send(200, {
+            "id": f"chatcmpl-stub-{number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", ""),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(fake_extraction(prompt))},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host="127.0.0.1", port=8001, delay=0.0, fail_rate=0.0):
+    """Start the stub in a background thread and return the server (``shutdown()`` to stop)."""
+    Handler.delay, Handler.fail_rate = delay, fail_rate
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds of latency per request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered with 429")
+    args = parser.parse_args(argv)
+
+    Handler.delay, Handler.fail_rate = args.delay, args.fail_rate
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Stub OpenAI endpoint on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
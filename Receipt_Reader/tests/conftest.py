@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules are imported the way Streamlit runs them, from the app folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def stub_openai():
+    """The stub OpenAI endpoint on a free port; yields its Handler so tests can set delay and fail_rate."""
+    from stub_openai import Handler, serve
+
+    server = serve(port=0)
+    Handler.requests_served = 0
+    yield server, Handler
+    server.shutdown()
+    server.server_close()
+    Handler.delay, Handler.fail_rate = 0.0, 0.0
+
+
+@pytest.fixture(scope="session")
+def tessdata():
+    """Tesseract language data for in-process OCR; skips when tesserocr or English data is missing."""
+    tesserocr = pytest.importorskip("tesserocr")
+    from ocr_engine import find_tessdata, find_tesseract
+
+    path = find_tessdata(find_tesseract())
+    if not path or "eng" not in tesserocr.get_languages(path)[1]:
+        pytest.skip("no English tessdata; set TESSDATA_PREFIX")
+    return path
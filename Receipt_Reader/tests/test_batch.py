@@ -0,0 +1,41 @@
+import io
+import zipfile
+from types import SimpleNamespace
+
+import openai
+
+from batch import receipt_files, review_rows
+
+
+def upload(name, data):
+    return SimpleNamespace(name=name, getvalue=lambda: data)
+
+
+def test_zip_archives_are_expanded_to_images():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("march/", "")
+        archive.writestr("march/a.JPG", b"a")
+        archive.writestr("march/.hidden.png", b"h")
+        archive.writestr("__MACOSX/march/._a.JPG", b"m")
+        archive.writestr("notes.txt", b"n")
+        archive.writestr("b.png", b"b")
+    files = receipt_files([upload("photo.jpeg", b"p"), upload("receipts.zip", buffer.getvalue())])
+    assert files == [
+        ("photo.jpeg", b"p"),
+        ("receipts.zip/march/a.JPG", b"a"),
+        ("receipts.zip/b.png", b"b"),
+    ]
+
+
+def test_review_rows_flag_failed_extractions():
+    error = openai.APIConnectionError(request=None)
+    rows = review_rows(
+        ["a.png", "b.png"],
+        [{"store_name": "Shop", "total": "1,234.50", "currency": ""}, error],
+        "2024-01-02", "2024-01", "A", "Food", "CAD",
+    )
+    assert rows["amount"].tolist() == [1234.5, 0.0]
+    assert rows["Currency"].tolist() == ["CAD", "CAD"]
+    assert rows["Status"][0] == "✅ Extracted"
+    assert rows["Status"][1].startswith("⚠️ APIConnectionError")
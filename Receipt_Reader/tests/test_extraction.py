@@ -0,0 +1,79 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import openai
+
+from extraction import extract_many
+from result_cache import ResultCache
+
+RECEIPTS = [f"CORNER SHOP\n1 MAIN ST\nMILK {i}.50\nTOTAL {i + 1}.00" for i in range(6)]
+
+
+def client_for(server):
+    host, port = server.server_address
+    return openai.AsyncOpenAI(api_key="test", base_url=f"http://{host}:{port}/v1", max_retries=0)
+
+
+def run(client, texts, cache, **kwargs):
+    async def go():
+        async with client:
+            return await extract_many(client, texts, cache, **kwargs)
+    return asyncio.run(go())
+
+
+def test_extracts_each_receipt_in_order(stub_openai, tmp_path):
+    server, handler = stub_openai
+    results = run(client_for(server), RECEIPTS, ResultCache("test", directory=str(tmp_path)))
+    assert [r["total"] for r in results] == [f"{i + 1}.00" for i in range(6)]
+    assert results[0]["store_name"] == "Corner Shop"
+    assert results[0]["items"] == {"1": {"name": "Milk", "price": "0.50"}}
+    assert handler.requests_served == 6
+
+
+def test_cached_receipts_skip_the_api(stub_openai, tmp_path):
+    server, handler = stub_openai
+    cache = ResultCache("test", directory=str(tmp_path))
+    first = run(client_for(server), RECEIPTS[:4], cache)
+    second = run(client_for(server), RECEIPTS, cache)
+    assert second[:4] == first
+    assert handler.requests_served == 6
+
+
+def test_rate_limited_requests_are_retried_then_reported(stub_openai, tmp_path):
+    server, handler = stub_openai
+    handler.fail_rate = 1.0
+    cache = ResultCache("test", directory=str(tmp_path))
+    results = run(client_for(server), RECEIPTS[:2], cache, retries=2, base_delay=0.001)
+    assert all(isinstance(r, openai.RateLimitError) for r in results)
+    assert handler.requests_served == 0
+    # Failures are not cached, so the next run asks again and succeeds
+    handler.fail_rate = 0.0
+    results = run(client_for(server), RECEIPTS[:2], cache, retries=2, base_delay=0.001)
+    assert [r["total"] for r in results] == ["1.00", "2.00"]
+
+
+class RecordingClient:
+    """Async client double that records how many requests are in flight at once."""
+
+    def __init__(self):
+        self.in_flight = self.peak = self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        content = json.dumps({"total": request["messages"][-1]["content"][-4:]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_concurrency_is_bounded(tmp_path):
+    client = RecordingClient()
+    texts = [f"TOTAL {i:04d}" for i in range(20)]
+    results = asyncio.run(extract_many(client, texts, ResultCache("test", directory=str(tmp_path)), concurrency=3))
+    assert [r["total"] for r in results] == [f"{i:04d}" for i in range(20)]
+    assert client.calls == 20
+    assert client.peak == 3
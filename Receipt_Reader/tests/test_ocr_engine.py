@@ -0,0 +1,57 @@
+import atexit
+import os
+import stat
+
+from PIL import Image, ImageDraw
+
+import ocr_engine
+from ocr_engine import OCREngine, find_tessdata
+
+
+def text_image(text):
+    image = Image.new("L", (600, 80), 255)
+    ImageDraw.Draw(image).text((10, 20), text, fill=0, font_size=40)
+    return image
+
+
+def test_tessdata_from_environment_first(monkeypatch):
+    monkeypatch.setenv("TESSDATA_PREFIX", "/data/tessdata")
+    assert find_tessdata("/no/such/tesseract") == "/data/tessdata"
+
+
+def test_tessdata_reported_by_binary(monkeypatch, tmp_path):
+    monkeypatch.delenv("TESSDATA_PREFIX", raising=False)
+    fake = tmp_path / "tesseract"
+    fake.write_text('#!/bin/sh\necho \'List of available languages in "/usr/share/tesseract-ocr/5/tessdata/" (2):\'\n')
+    fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+    assert find_tessdata(str(fake)) == "/usr/share/tesseract-ocr/5/tessdata/"
+    assert find_tessdata(str(tmp_path / "missing")) is None
+    assert find_tessdata(None) is None
+
+
+def test_warm_backend_in_process_and_in_workers(tessdata, monkeypatch):
+    monkeypatch.setenv("TESSDATA_PREFIX", tessdata)
+    engine = OCREngine(lang="eng", workers=2)
+    try:
+        assert engine.backend == "tesserocr"
+        images = [text_image("TOTAL 12.34"), text_image("STORE 56.78")]
+        single = [engine.recognize(image) for image in images]
+        assert "12.34" in single[0] and "56.78" in single[1]
+        assert engine.recognize_many(images) == single
+    finally:
+        engine.close()
+    assert engine._pool is None and engine._backend.api is None
+    engine.close()
+
+
+def test_close_runs_at_exit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(atexit, "unregister", registered.remove)
+    monkeypatch.setattr(ocr_engine, "find_tesseract", lambda: os.devnull)
+    monkeypatch.setattr(ocr_engine, "find_tessdata", lambda cmd: None)
+    monkeypatch.setattr(ocr_engine, "_open_api", lambda lang, tessdata: None)
+    engine = OCREngine()
+    assert registered == [engine.close]
+    engine.close()
+    assert registered == []
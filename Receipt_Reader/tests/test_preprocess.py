@@ -0,0 +1,53 @@
+import os
+
+from PIL import Image, ImageDraw
+
+from preprocess import OCR_WIDTH, open_oriented, prepare_receipt, receipt_bbox, receipt_mask
+
+RECEIPT_PHOTO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "receipt test.jpeg")
+
+
+def test_bundled_photo_is_cropped_to_the_receipt():
+    image = open_oriented(RECEIPT_PHOTO)
+    box = receipt_bbox(image)
+    assert box is not None
+    left, top, right, bottom = box
+    # The receipt runs top to bottom through the middle, with wood on both sides
+    assert 0.3 * image.width < right - left < 0.7 * image.width
+    assert left > 0.15 * image.width and right < 0.85 * image.width
+    assert bottom - top > 0.8 * image.height
+
+    # The crop, not the whole photo, is scaled to the OCR width
+    ocr_image, _ = prepare_receipt(RECEIPT_PHOTO)
+    assert ocr_image.width >= OCR_WIDTH
+    assert ocr_image.height > 1.8 * ocr_image.width
+
+
+def test_no_receipt_without_paper():
+    # Uniformly tinted wood-like surface
+    assert receipt_mask(Image.new("RGB", (400, 300), (170, 120, 70))) is None
+    # Paper filling the frame has no edge to crop to
+    blank = Image.new("RGB", (400, 300), (245, 245, 240))
+    ImageDraw.Draw(blank).text((20, 20), "TOTAL 12.34", fill=(0, 0, 0))
+    assert receipt_bbox(blank) is None
+
+
+def test_synthetic_receipt_on_a_table():
+    image = Image.new("RGB", (600, 400), (150, 100, 60))
+    ImageDraw.Draw(image).rectangle((200, 40, 380, 360), fill=(240, 238, 232))
+    mask = receipt_mask(image, sample_side=300)
+    assert mask is not None and 0.15 < mask.mean() < 0.35
+    left, top, right, bottom = receipt_bbox(image)
+    assert abs(left - 200) < 15 and abs(right - 381) < 15
+    assert abs(top - 40) < 15 and abs(bottom - 361) < 15
+
+
+def test_bundled_photo_reads_store_and_total(tessdata):
+    import tesserocr
+
+    ocr_image, _ = prepare_receipt(RECEIPT_PHOTO)
+    with tesserocr.PyTessBaseAPI(path=tessdata, lang="eng") as api:
+        api.SetImage(ocr_image)
+        text = api.GetUTF8Text()
+    assert "Main Street Restaurant" in text
+    assert "29.01" in text
@@ -0,0 +1,63 @@
+import pytest
+
+from sheet_writer import START_ROW, FakeWorksheet, SheetWriter, updated_rows
+
+ORDER = ["who", "amount", "what"]
+
+
+def expense(i):
+    return {"who": "A", "amount": str(i), "what": f"store {i}"}
+
+
+def test_updated_rows():
+    assert updated_rows({"updates": {"updatedRange": "'Expenses'!A18:C20"}}) == (18, 20)
+    assert updated_rows({"updates": {"updatedRange": "'Expenses'!A18"}}) == (18, 18)
+
+
+def test_batch_is_one_append_call():
+    sheet = FakeWorksheet()
+    writer = SheetWriter(sheet, ORDER)
+    assert writer.append([expense(i) for i in range(3)]) == [START_ROW, START_ROW + 1, START_ROW + 2]
+    assert writer.append([expense(3)]) == [START_ROW + 3]
+    assert sheet.calls == {"append_rows": 2}
+    assert sheet.rows[START_ROW - 1] == ["A", "0", "store 0"]
+    assert sheet.rows[-1] == ["A", "3", "store 3"]
+
+
+def test_rows_follow_other_writers():
+    sheet = FakeWorksheet()
+    first, second = SheetWriter(sheet, ORDER), SheetWriter(sheet, ORDER)
+    assert first.append([expense(0)]) == [START_ROW]
+    assert second.append([expense(1), expense(2)]) == [START_ROW + 1, START_ROW + 2]
+    assert first.append([expense(3)]) == [START_ROW + 3]
+
+
+def test_missing_columns_are_blank_and_empty_batch_is_free():
+    sheet = FakeWorksheet()
+    writer = SheetWriter(sheet, ORDER)
+    assert writer.append([]) == []
+    assert sheet.calls == {}
+    writer.append([{"who": "B"}])
+    assert sheet.rows[START_ROW - 1] == ["B", "", ""]
+
+
+class FailingWorksheet(FakeWorksheet):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def append_rows(self, values, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sheets unavailable")
+        return super().append_rows(values, **kwargs)
+
+
+def test_failed_append_writes_nothing_and_resubmit_writes_once():
+    sheet = FailingWorksheet(failures=1)
+    writer = SheetWriter(sheet, ORDER)
+    with pytest.raises(ConnectionError):
+        writer.append([expense(0)])
+    assert len(sheet.rows) == START_ROW - 1
+    assert writer.append([expense(0)]) == [START_ROW]
+    assert len(sheet.rows) == START_ROW
@@ -0,0 +1,195 @@
+"""
+Headless rerun benchmarks for the three Streamlit apps.
+
+Each app is driven with Streamlit's AppTest through a scripted sequence of
+interactions, offline (see stubs.py). For every step the harness records
+wall time, peak Python memory (tracemalloc) and the size of what would be
+sent to the browser (Plotly figure JSON, dataframe and table messages), and writes
+everything as JSON so runs can be compared across commits:
+
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --app mlb --repeat 5
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from streamlit.testing.v1 import AppTest
+
+import stubs
+
+ROOT = stubs.ROOT
+APPS = {
+    "mlb": os.path.join(ROOT, "MLB", "MLB.py"),
+    "flight_lounges": os.path.join(ROOT, "Flight_Lounges", "Flight_Loungest.py"),
+    "receipt_reader": os.path.join(ROOT, "Receipt_Reader", "Receipt_Reader.py"),
+}
+TIMEOUT = 600
+
+
+def widget(at, kind, label):
+    """First widget of ``kind`` (e.g. "multiselect") with the given label, main area or sidebar."""
+    for element in getattr(at, kind):
+        if element.label == label:
+            return element
+    raise LookupError(f"No {kind} labelled {label!r}")
+
+
+def payload(at):
+    """Serialized bytes the current run would ship to the browser, by element type."""
+    sizes = {"plotly_chart": 0, "dataframe": 0, "table": 0, "elements": 0}
+    for kind in ("plotly_chart", "dataframe", "table"):
+        for element in at.get(kind):
+            # The whole message: figure JSON or Arrow bytes plus styling and column config
+            sizes[kind] += element.proto.ByteSize()
+            sizes["elements"] += 1
+    return sizes
+
+
+class StepFailed(RuntimeError):
+    """The app raised during a step, so its timings are not comparable."""
+
+
+def measure(name, action):
+    """
+    Run one interaction and return its timing, memory and payload record.
+
+    Raises StepFailed if the script raised, or caught an error and showed
+    it (st.error or the Flight app's catch-all banner), instead of
+    reporting timings for a run that stopped part way.
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    at = action()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    errors = [str(e.value) for e in at.exception]
+    errors += [e.value for e in at.error]
+    errors += [m.value for m in at.markdown if "An error occurred" in m.value]
+    if errors:
+        raise StepFailed(f"{name!r} failed: " + "; ".join(errors))
+
+    record = {
+        "step": name,
+        "seconds": round(seconds, 4),
+        "peak_mb": round(peak / 2**20, 2),
+        "payload_bytes": payload(at),
+    }
+    # Per-stage timings recorded by the app itself, when it exposes them
+    stages = at.session_state["_stage_timings"] if "_stage_timings" in at.session_state else None
+    if stages:
+        record["stages"] = stages
+    return record
+
+
+def mlb_steps(at):
+    yield "initial load", lambda: at.run(timeout=TIMEOUT)
+    yield "full-season date range", lambda: widget(at, "slider", "Number of Days").set_value(250).run(timeout=TIMEOUT)
+    yield "select 5 teams", lambda: widget(at, "multiselect", "Select Team").set_value(
+        widget(at, "multiselect", "Select Team").options[:5]).run(timeout=TIMEOUT)
+    yield "next week", lambda: widget(at, "button", "Next Week").click().run(timeout=TIMEOUT)
+    yield "cumulative within window", lambda: widget(
+        at, "toggle", "Count games from the start of the selected window").set_value(True).run(timeout=TIMEOUT)
+
+
+def flight_steps(at):
+    yield "initial load", lambda: at.run(timeout=TIMEOUT)
+    yield "pick 50 airports", lambda: widget(at, "multiselect", "Select Airport(s)").set_value(
+        widget(at, "multiselect", "Select Airport(s)").options[:50]).run(timeout=TIMEOUT)
+    yield "great-circle routes", lambda: widget(at, "checkbox", "Draw routes as great circles").set_value(True).run(timeout=TIMEOUT)
+    yield "single airport", lambda: widget(at, "selectbox", "Select Airport").set_value(
+        widget(at, "selectbox", "Select Airport").options[1]).run(timeout=TIMEOUT)
+    yield "nearby lounges", lambda: widget(at, "selectbox", "Center Airport").set_value(
+        widget(at, "selectbox", "Center Airport").options[1]).run(timeout=TIMEOUT)
+
+
+def receipt_steps(at, upload_state):
+    def upload():
+        upload_state["receipt"] = True
+        return at.run(timeout=TIMEOUT)
+
+    yield "initial load", lambda: at.run(timeout=TIMEOUT)
+    yield "upload receipt", upload
+    yield "rerun with receipt", lambda: at.run(timeout=TIMEOUT)
+    yield "add itemisation", lambda: widget(at, "button", "➕ Add Itemisation").click().run(timeout=TIMEOUT)
+
+
+def run_app(name):
+    """One pass of the scripted interactions for ``name``, in a fresh AppTest."""
+    files = {}
+    upload_state = {"receipt": False}
+    if name == "flight_lounges":
+        lounges_csv, routes_csv = stubs.flight_fixtures()
+        files = {stubs.LOUNGES_DRIVE_ID: lounges_csv, stubs.ROUTES_DRIVE_ID: routes_csv}
+
+    at = AppTest.from_file(APPS[name], default_timeout=TIMEOUT)
+    if name == "receipt_reader":
+        at.secrets["OPENAI_API_KEY"] = "sk-benchmark"
+        steps = receipt_steps(at, upload_state)
+    elif name == "flight_lounges":
+        steps = flight_steps(at)
+    else:
+        steps = mlb_steps(at)
+
+    def upload():
+        return stubs.UploadedReceipt() if upload_state["receipt"] else None
+
+    with stubs.offline(files=files, upload=upload):
+        return [measure(step, action) for step, action in steps]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", choices=sorted(APPS), action="append", help="app(s) to run, default all")
+    parser.add_argument("--repeat", type=int, default=1, help="passes per app, each in a fresh AppTest")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Keep snapshots and caches out of the repo and off the network
+    cache_dir = tempfile.mkdtemp(prefix="streamlit-apps-bench-")
+    os.environ.setdefault("FLIGHT_LOUNGES_CACHE_DIR", os.path.join(cache_dir, "flight"))
+    os.environ.setdefault("MLB_CACHE_DIR", os.path.join(cache_dir, "mlb"))
+    os.environ.setdefault("MLB_SCHEDULE_TTL", "0")
+    # Per-stage timings from the apps' own instrumentation
+    os.environ.setdefault("STREAMLIT_APPS_PROFILE", "1")
+    for path in APPS.values():
+        sys.path.insert(0, os.path.dirname(path))
+
+    import streamlit
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "apps": {},
+    }
+    for name in args.app or sorted(APPS):
+        results["apps"][name] = [run_app(name) for _ in range(args.repeat)]
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
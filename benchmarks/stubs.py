@@ -0,0 +1,197 @@
+"""
+Stand-ins for the network, OCR and LLM calls the apps make, so the
+benchmarks run offline against the data bundled in the repo.
+"""
+import hashlib
+import io
+import json
+import os
+import subprocess
+from contextlib import contextmanager
+from unittest import mock
+
+import pandas as pd
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUTES_PARQUET = os.path.join(ROOT, "Flight_Lounges", "routes.parquet")
+RECEIPT_IMAGE = os.path.join(ROOT, "Receipt_Reader", "receipt test.jpeg")
+
+# Google Drive ids used as defaults by Flight_Loungest.py
+LOUNGES_DRIVE_ID = "1dmumzrtLm-rkeUfbkjOhNiY7UJ1OC_rV"
+ROUTES_DRIVE_ID = "1LVaUcPnBjYzq5kLMv5Bn4Bw__Hs1x-xw"
+
+LOUNGE_NETWORKS = [
+    "Priority Pass Lounge", "Centurion Lounge", "Plaza Premium Lounge",
+    "Star Alliance Lounge", "Oneworld Lounge", "SkyTeam Lounge",
+    "Admirals Club", "Delta Sky Club", "United Club", "Escape Lounge",
+]
+
+RECEIPT_TEXT = """WHOLE FOODS MARKET
+123 MAIN ST
+BANANAS 1.99
+OAT MILK 4.49
+SOURDOUGH 6.00
+TOTAL 12.48
+"""
+
+RECEIPT_JSON = {
+    "store_name": "Whole Foods Market",
+    "address": "123 Main St",
+    "items": {
+        "1": {"name": "Bananas", "price": "1.99"},
+        "2": {"name": "Oat Milk", "price": "4.49"},
+        "3": {"name": "Sourdough", "price": "6.00"},
+    },
+    "total": "12.48",
+    "currency": "USD",
+}
+
+
+def _position(code):
+    # Deterministic pseudo-coordinates per airport code
+    digest = hashlib.sha256(code.encode("utf-8")).digest()
+    lat = -55 + 125 * int.from_bytes(digest[:4], "big") / 2**32
+    lon = -180 + 360 * int.from_bytes(digest[4:8], "big") / 2**32
+    return round(lat, 5), round(lon, 5)
+
+
+def read_routes(path=ROUTES_PARQUET, columns=None):
+    # routes.parquet in the repo is CSV text despite its name; sniff like data_store does
+    with open(path, "rb") as f:
+        is_parquet = f.read(4) == b"PAR1"
+    return pd.read_parquet(path, columns=columns) if is_parquet else pd.read_csv(path, usecols=columns)
+
+
+def flight_fixtures(lounge_airports=400):
+    """
+    (lounges CSV bytes, routes CSV bytes) built from the bundled routes.parquet.
+
+    The bundled routes have no coordinates and there is no lounges file, so
+    airports get deterministic pseudo-coordinates and the busiest airports
+    get a few lounges from a fixed set of networks.
+    """
+    routes = read_routes(columns=["Airline", "Source airport", "Destination airport"])
+    routes = routes.dropna()
+    codes = pd.unique(pd.concat([routes["Source airport"], routes["Destination airport"]]).astype(str))
+    positions = {code: _position(code) for code in codes}
+
+    for side in ("Source", "Destination"):
+        coords = routes[f"{side} airport"].astype(str).map(positions)
+        routes[f"{side} Latitude"] = [c[0] for c in coords]
+        routes[f"{side} Longitude"] = [c[1] for c in coords]
+
+    busiest = pd.concat([routes["Source airport"], routes["Destination airport"]]).value_counts().index[:lounge_airports]
+    rows = []
+    for rank, code in enumerate(busiest):
+        lat, lon = positions[code]
+        for k in range(1 + rank % 4):
+            rows.append({
+                "IATA Code": code,
+                "Airport Name": f"{code} International",
+                "Lounge Name": LOUNGE_NETWORKS[(rank + k) % len(LOUNGE_NETWORKS)],
+                "Latitude": lat,
+                "Longitude": lon,
+            })
+    lounges = pd.DataFrame(rows)
+    return lounges.to_csv(index=False).encode("utf-8"), routes.to_csv(index=False).encode("utf-8")
+
+
+class FakeResponse:
+    def __init__(self, content=b"", status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = content.decode("utf-8", errors="replace")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} from stub")
+
+    def iter_content(self, chunk_size=1024):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def fake_get(files):
+    """requests.get replacement serving ``files`` (Drive id -> bytes), 404 for anything else."""
+    def get(url, *args, **kwargs):
+        for drive_id, content in files.items():
+            if drive_id in url:
+                return FakeResponse(content, headers={"ETag": hashlib.sha256(content).hexdigest()})
+        return FakeResponse(status_code=404)
+    return get
+
+
+class FakeOpenAI:
+    """Minimal OpenAI client: every chat completion returns RECEIPT_JSON."""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+        self.chat = mock.Mock()
+        self.chat.completions.create.side_effect = self._create
+
+    def _create(self, *args, **kwargs):
+        self.calls += 1
+        message = mock.Mock(content=json.dumps(RECEIPT_JSON))
+        return mock.Mock(choices=[mock.Mock(message=message)])
+
+
+class UploadedReceipt(io.BytesIO):
+    """Stands in for st.file_uploader's UploadedFile."""
+
+    def __init__(self, path=RECEIPT_IMAGE):
+        with open(path, "rb") as f:
+            super().__init__(f.read())
+        self.name = os.path.basename(path)
+        self.type = "image/jpeg"
+        self.size = len(self.getvalue())
+
+
+def fake_run(*args, **kwargs):
+    # apt-get and friends: pretend they succeeded without running anything
+    empty = "" if kwargs.get("text") else b""
+    return subprocess.CompletedProcess(args[0] if args else kwargs.get("args"), 0, empty, empty)
+
+
+@contextmanager
+def offline(files=None, upload=None):
+    """
+    Patch network, subprocess, OCR and LLM entry points for the duration.
+
+    ``files`` maps Google Drive ids to the bytes to serve; ``upload`` is a
+    callable returning the object st.file_uploader should return (None for
+    no upload).
+    """
+    import streamlit as st
+
+    patches = [
+        mock.patch("requests.get", fake_get(files or {})),
+        mock.patch("subprocess.run", fake_run),
+        mock.patch.object(st, "file_uploader", lambda *a, **k: upload() if upload else None),
+    ]
+    # Optional app dependencies are only stubbed where installed
+    for target, replacement in (
+        ("pytesseract.image_to_string", lambda *a, **k: RECEIPT_TEXT),
+        ("ocr_engine.find_tesseract", lambda: "tesseract"),
+        # Keep OCR on the stubbed pytesseract path even where tesserocr is installed
+        ("ocr_engine._open_api", lambda lang, tessdata: None),
+        ("openai.OpenAI", FakeOpenAI),
+    ):
+        module = target.rsplit(".", 1)[0]
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        patches.append(mock.patch(target, replacement))
+
+    for patch in patches:
+        patch.start()
+    try:
+        yield
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The harness is run as a script from the benchmarks folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,29 @@
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from run_benchmarks import StepFailed, measure, payload
+
+SCRIPT = """
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+frame = pd.DataFrame({"a": range(100), "b": range(100)})
+st.dataframe(frame)
+st.table(frame.head(3))
+st.plotly_chart(px.line(frame, x="a", y="b"))
+"""
+
+
+def test_payload_counts_tables_and_charts():
+    sizes = payload(AppTest.from_string(SCRIPT).run())
+    assert sizes["dataframe"] > 100 * 8
+    assert sizes["table"] > 0
+    assert sizes["plotly_chart"] > 0
+    assert sizes["elements"] == 3
+
+
+def test_step_that_shows_an_error_fails():
+    at = AppTest.from_string("import streamlit as st\nst.error('boom')")
+    with pytest.raises(StepFailed, match="boom"):
+        measure("error", at.run)
@@ -0,0 +1,126 @@
+import datetime
+import json
+import os
+import time
+
+import pandas as pd
+import streamlit as st
+
+# Shared by the apps; each one puts the repo root on sys.path before importing it.
+
+# Turn on with ?profile=1 in the URL or STREAMLIT_APPS_PROFILE=1 in the environment
+QUERY_PARAM = "profile"
+ENV_VAR = "STREAMLIT_APPS_PROFILE"
+# Append every profiled rerun to this JSON-lines file when set
+LOG_PATH = os.environ.get("STREAMLIT_APPS_PROFILE_LOG")
+
+
+class _Stage:
+    """One timed stage; callers may fill in rows_in, rows_out and bytes."""
+
+    def __init__(self, profiler, name, rows_in=None):
+        self.profiler = profiler
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.bytes = None
+        self.seconds = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+        self.profiler.records.append(self)
+        return False
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "ms": round(self.seconds * 1000, 2),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "bytes": self.bytes,
+        }
+
+
+class _NullStage:
+    """Shared do-nothing stage used while profiling is off."""
+
+    rows_in = rows_out = bytes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _frame_bytes(frame):
+    frame = getattr(frame, "data", frame)  # unwrap a Styler
+    return int(frame.memory_usage(index=True).sum()) if hasattr(frame, "memory_usage") else None
+
+
+class Profiler:
+    """
+    Opt-in per-stage timing for a rerun.
+
+    While disabled every method is a cheap pass-through, so the stages can
+    stay wrapped in production.
+    """
+
+    def __init__(self, app, enabled=False):
+        self.app = app
+        self.enabled = enabled
+        self.records = []
+
+    @classmethod
+    def from_environment(cls, app):
+        enabled = os.environ.get(ENV_VAR) == "1" or st.query_params.get(QUERY_PARAM) in ("1", "true")
+        return cls(app, enabled)
+
+    def stage(self, name, rows_in=None):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows_in)
+
+    def plotly_chart(self, name, fig, **kwargs):
+        """st.plotly_chart, recording the time to send the figure and its JSON size."""
+        if not self.enabled:
+            return st.plotly_chart(fig, **kwargs)
+        size = len(fig.to_json())
+        with self.stage(name) as stage:
+            stage.bytes = size
+            return st.plotly_chart(fig, **kwargs)
+
+    def dataframe(self, name, frame, **kwargs):
+        """st.dataframe, recording the time to send the frame, its rows and in-memory size."""
+        if not self.enabled:
+            return st.dataframe(frame, **kwargs)
+        with self.stage(name, rows_in=len(getattr(frame, "data", frame))) as stage:
+            stage.bytes = _frame_bytes(frame)
+            return st.dataframe(frame, **kwargs)
+
+    def panel(self):
+        """Show this rerun's stages in the sidebar and, if configured, append them to LOG_PATH."""
+        if not self.enabled:
+            return
+        rows = [record.as_dict() for record in self.records]
+        st.session_state["_stage_timings"] = rows
+
+        with st.sidebar.expander("⏱️ Stage timings", expanded=True):
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+            st.caption(f"Total: {sum(r['ms'] for r in rows):.1f} ms")
+
+        if LOG_PATH:
+            entry = {
+                "app": self.app,
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "stages": rows,
+            }
+            with open(LOG_PATH, "a") as f:
+                f.write(json.dumps(entry) + "\n")